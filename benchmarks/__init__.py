@@ -0,0 +1 @@
+"""Blank init file."""
@@ -0,0 +1,70 @@
+"""Compare face detection time and hit rate at several downscale ratios.
+
+Usage: python -m benchmarks.detect_scales <image_dir> [--scales 1.0 0.5 0.25]
+
+Detections at full resolution are the reference; the hit rate at each scale is
+the fraction of reference faces matched by a box with IoU above 0.3.
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import cv2  # type: ignore[import]
+
+from facial_recognition.detect import FaceDetector
+from facial_recognition.tracking import iou
+
+logger = logging.getLogger(__name__)
+
+IOU_MATCH = 0.3
+
+
+def benchmark_scale(images: list[Any], reference: list[Any], scale: float) -> dict[str, float]:
+    """Time detection over ``images`` at ``scale`` and score it against ``reference`` boxes."""
+    detector = FaceDetector(scale=scale)
+    elapsed = 0.0
+    matched = 0
+    for gray, expected in zip(images, reference, strict=True):
+        start = time.perf_counter()
+        found = detector.detect(gray)
+        elapsed += time.perf_counter() - start
+        matched += sum(1 for box in expected if any(iou(box, other) > IOU_MATCH for other in found))
+
+    total = sum(len(boxes) for boxes in reference)
+    return {
+        "scale": scale,
+        "ms_per_frame": 1000 * elapsed / len(images),
+        "hit_rate": matched / total if total else 1.0,
+    }
+
+
+def main() -> None:
+    """Run the benchmark over every image in a directory."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("image_dir", type=Path)
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.75, 0.5, 0.33, 0.25])
+    args = parser.parse_args()
+
+    images = [
+        img for img in (cv2.imread(str(p), cv2.IMREAD_GRAYSCALE) for p in sorted(args.image_dir.glob("*.jpg")))
+        if img is not None
+    ]
+    if not images:
+        logger.info("No .jpg images found in %s", args.image_dir)
+        return
+
+    reference_detector = FaceDetector(scale=1.0)
+    reference = [reference_detector.detect(gray) for gray in images]
+
+    logger.info("%8s %14s %10s", "scale", "ms/frame", "hit rate")
+    for scale in args.scales:
+        result = benchmark_scale(images, reference, scale)
+        logger.info("%8.2f %14.1f %9.0f%%", result["scale"], result["ms_per_frame"], 100 * result["hit_rate"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
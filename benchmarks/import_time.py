@@ -0,0 +1,76 @@
+"""Report how long the mirror's modules take to import, from ``python -X importtime``.
+
+Usage: python -m benchmarks.import_time [module ...] [--top 15]
+
+Each module is imported in a fresh interpreter. The report lists the total
+import time of each module, then the slowest top-level packages. These are
+ranked by their own import time summed over every submodule, so that e.g.
+all of ``cv2`` counts as one line.
+"""
+
+import argparse
+import logging
+import subprocess
+import sys
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# What main imports before the first paint, and what it loads afterwards
+DEFAULT_MODULES = ["main", "weather", "facial_recognition.recognize"]
+
+
+def import_times(module: str) -> list[tuple[str, int, int]]:
+    """Import ``module`` in a new interpreter and return (name, self us, cumulative us) per import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        msg = f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}"
+        raise RuntimeError(msg)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():  # noqa: PLR2004
+            continue  # header line
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def summarize(rows: list[tuple[str, int, int]]) -> tuple[int, list[tuple[str, int]]]:
+    """Return the total microseconds and per top-level package self time, slowest first."""
+    per_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        per_package[name.split(".")[0]] += self_us
+    total = sum(self_us for _, self_us, _ in rows)
+    return total, sorted(per_package.items(), key=lambda item: item[1], reverse=True)
+
+
+def main() -> None:
+    """Print the import time report for each requested module."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=15, help="number of packages to list per module")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            total, packages = summarize(import_times(module))
+        except RuntimeError as e:
+            logger.info("%s", e)
+            continue
+
+        logger.info("import %s: %.0f ms", module, total / 1000)
+        for package, self_us in packages[:args.top]:
+            logger.info("  %-32s %8.1f ms %5.1f%%", package, self_us / 1000, 100 * self_us / total)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,150 @@
+"""Write a synthetic Open-Meteo forecast response for the offline weather benchmark.
+
+Usage: python -m benchmarks.make_weather_fixture [output]
+
+The file has the same layout as ``/v1/forecast?...&format=flatbuffers``: one
+length-prefixed ``WeatherApiResponse`` per location, with the variables
+requested by :func:`weather.get_weather_data` in order. A real recording works
+just as well, e.g.::
+
+    curl -o benchmarks/data/forecast.bin "https://api.open-meteo.com/v1/forecast?latitude=...&format=flatbuffers&..."
+"""
+
+import argparse
+import logging
+import struct
+from pathlib import Path
+
+import flatbuffers  # type: ignore[import]
+import numpy as np  # type: ignore[import]
+
+from weather import CURRENT_VARS, DAILY_VARS, HOURLY_VARS
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_FILE = Path(__file__).parent / "data" / "forecast.bin"
+
+# (name, latitude, longitude, timezone, UTC offset in seconds) of each location in the fixture
+FIXTURE_LOCATIONS = [
+    ("Home", 42.48948, -83.14465, "America/New_York", -14400),
+    ("London", 51.5, -0.12, "Europe/London", 3600),
+]
+
+# Local midnight of the first forecast day, as UTC epoch seconds at offset 0
+FIRST_DAY = 1760745600
+HOURS = 168
+DAYS = 7
+
+# Field slots of the Open-Meteo FlatBuffers schema
+VARIABLE_FIELDS = 13
+VARIABLE_VALUE = 2
+VARIABLE_VALUES = 3
+VARIABLE_VALUES_INT64 = 4
+SERIES_FIELDS = 4
+RESPONSE_FIELDS = 15
+RESPONSE_LATITUDE = 0
+RESPONSE_LONGITUDE = 1
+RESPONSE_UTC_OFFSET = 6
+RESPONSE_TIMEZONE = 7
+RESPONSE_CURRENT = 9
+RESPONSE_DAILY = 10
+RESPONSE_HOURLY = 11
+
+
+def variable(
+    builder: flatbuffers.Builder,
+    value: float | None = None,
+    values: np.ndarray | None = None,
+    ints: list[int] | None = None,
+) -> int:
+    """Add one ``VariableWithValues`` table and return its offset."""
+    values_offset = ints_offset = None
+    if values is not None:
+        builder.StartVector(4, len(values), 4)
+        for v in reversed(values):
+            builder.PrependFloat32(float(v))
+        values_offset = builder.EndVector()
+    if ints is not None:
+        builder.StartVector(8, len(ints), 8)
+        for v in reversed(ints):
+            builder.PrependInt64(int(v))
+        ints_offset = builder.EndVector()
+
+    builder.StartObject(VARIABLE_FIELDS)
+    if value is not None:
+        builder.PrependFloat32Slot(VARIABLE_VALUE, float(value), 0.0)
+    if values_offset is not None:
+        builder.PrependUOffsetTRelativeSlot(VARIABLE_VALUES, values_offset, 0)
+    if ints_offset is not None:
+        builder.PrependUOffsetTRelativeSlot(VARIABLE_VALUES_INT64, ints_offset, 0)
+    return builder.EndObject()
+
+
+def series(builder: flatbuffers.Builder, start: int, end: int, interval: int, variables: list[int]) -> int:
+    """Add one ``VariablesWithTime`` table (current, hourly or daily) and return its offset."""
+    builder.StartVector(4, len(variables), 4)
+    for v in reversed(variables):
+        builder.PrependUOffsetTRelative(v)
+    vector = builder.EndVector()
+
+    builder.StartObject(SERIES_FIELDS)
+    builder.PrependInt64Slot(0, start, 0)
+    builder.PrependInt64Slot(1, end, 0)
+    builder.PrependInt32Slot(2, interval, 0)
+    builder.PrependUOffsetTRelativeSlot(3, vector, 0)
+    return builder.EndObject()
+
+
+def response(latitude: float, longitude: float, timezone: str, utc_offset: int) -> bytes:
+    """Return one length-prefixed forecast response with deterministic values."""
+    builder = flatbuffers.Builder(1024)
+    rng = np.random.default_rng(int(abs(latitude * 1000)))
+    start = FIRST_DAY - utc_offset
+
+    current_values = dict(zip(CURRENT_VARS, [61.3, 72, 59.8, 0.0, 0.0, 0.0, 0.0, 40, 200, 7.4], strict=True))
+    current = series(builder, start + 1800, start + 2700, 900,
+                     [variable(builder, value=current_values[var]) for var in CURRENT_VARS])
+    hourly = series(builder, start, start + HOURS * 3600, 3600,
+                    [variable(builder, values=rng.uniform(0, 80, HOURS)) for _ in HOURLY_VARS])
+
+    daily_variables = []
+    for var in DAILY_VARS:
+        if var == "sunrise":
+            daily_variables.append(variable(builder, ints=[start + d * 86400 + 25200 + 60 * d for d in range(DAYS)]))
+        elif var == "sunset":
+            daily_variables.append(variable(builder, ints=[start + d * 86400 + 68400 - 60 * d for d in range(DAYS)]))
+        else:
+            daily_variables.append(variable(builder, values=rng.uniform(0, 8, DAYS)))
+    daily = series(builder, start, start + DAYS * 86400, 86400, daily_variables)
+
+    timezone_offset = builder.CreateString(timezone)
+    builder.StartObject(RESPONSE_FIELDS)
+    builder.PrependFloat32Slot(RESPONSE_LATITUDE, latitude, 0)
+    builder.PrependFloat32Slot(RESPONSE_LONGITUDE, longitude, 0)
+    builder.PrependInt32Slot(RESPONSE_UTC_OFFSET, utc_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(RESPONSE_TIMEZONE, timezone_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(RESPONSE_CURRENT, current, 0)
+    builder.PrependUOffsetTRelativeSlot(RESPONSE_DAILY, daily, 0)
+    builder.PrependUOffsetTRelativeSlot(RESPONSE_HOURLY, hourly, 0)
+    builder.Finish(builder.EndObject())
+    data = bytes(builder.Output())
+    return struct.pack("<I", len(data)) + data
+
+
+def main() -> None:
+    """Write the fixture for every location in ``FIXTURE_LOCATIONS``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path, nargs="?", default=FIXTURE_FILE)
+    args = parser.parse_args()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_bytes(b"".join(
+        response(latitude, longitude, timezone, offset)
+        for _, latitude, longitude, timezone, offset in FIXTURE_LOCATIONS
+    ))
+    logger.info("Wrote %s", args.output)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,399 @@
+"""Offline benchmarks for the vision and weather hot paths.
+
+Usage:
+    python -m benchmarks.suite run [--output results.json] [--frames DIR] [--repeat 5] [--quick]
+    python -m benchmarks.suite compare baseline.json results.json [--tolerance 0.25]
+
+``run`` times face detection, recognizer predictions, full and incremental
+training at several dataset sizes, enrollment through the frame pipeline and
+weather parsing. Everything runs without a camera or network:
+
+- frames are synthetic unless ``--frames`` points at recorded images;
+- datasets are synthetic faces with a fresh crop store, so no detection runs;
+- enrollment replays frames through :class:`ReplaySource`, with a stand-in
+  detector when there are no recorded frames to find faces in;
+- weather is the response in ``benchmarks/data/forecast.bin`` served from
+  localhost, fetched without a cache and parsed by :func:`weather.get_weather_data`.
+
+Every metric is a median time in milliseconds, so lower is better. Benchmarks
+that cannot run here (e.g. no Haar cascade or SFace model installed) are
+listed as skipped. ``compare`` exits with status 1 when any metric is more
+than ``--tolerance`` slower than the baseline.
+
+No baseline is committed, since timings only compare on the same hardware.
+Record one on the mirror (or whichever machine runs the comparisons) from a
+known-good commit, then compare later runs on that machine against it::
+
+    git checkout main
+    python -m benchmarks.suite run --output baseline.json
+    git checkout my-branch
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite compare baseline.json results.json
+
+Re-record the baseline whenever the hardware, OpenCV or Python changes.
+"""
+
+import argparse
+import http.server
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import cv2  # type: ignore[import]
+import numpy as np  # type: ignore[import]
+
+from configuration.settings import CAMERA_RESOLUTION, NUM_SAMPLES
+from facial_recognition import recognize, register
+from facial_recognition.backends import get_backend
+from facial_recognition.camera import ReplaySource
+from facial_recognition.detect import FaceDetector
+from facial_recognition.store import FACE_SIZE, save_faces
+
+logger = logging.getLogger(__name__)
+
+# (people, samples per person) of each dataset trained on
+TRAIN_SIZES = [(2, 50), (5, 50), (10, 50)]
+QUICK_TRAIN_SIZES = [(2, 10), (5, 10)]
+
+# Synthetic frames timed per detection benchmark
+FRAME_COUNT = 20
+
+# Differences below this many milliseconds are never reported as regressions
+MIN_REGRESSION_MS = 0.05
+
+# Longest enrollment is allowed to take before it is reported as skipped
+REGISTER_TIMEOUT = 120.0
+
+
+class SkipBenchmarkError(Exception):
+    """Raised by a benchmark that cannot run in this environment."""
+
+
+def timed(work: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> float:
+    """Return the median milliseconds ``work`` takes over ``repeat`` runs, each after an untimed ``setup``."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        work()
+        samples.append(1000 * (time.perf_counter() - start))
+    return statistics.median(samples)
+
+
+@contextmanager
+def working_directory(path: Path) -> Iterator[None]:
+    """Run the block with ``path`` as the current directory (dataset, models and caches are relative)."""
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def synthetic_frames(count: int, resolution: tuple[int, int] = CAMERA_RESOLUTION, seed: int = 0) -> list[np.ndarray]:
+    """Return ``count`` deterministic BGR frames of smooth noise at ``resolution``."""
+    rng = np.random.default_rng(seed)
+    width, height = resolution
+    frames = []
+    for _ in range(count):
+        small = rng.integers(0, 256, (height // 16, width // 16, 3), dtype=np.uint8)
+        frame = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+        frames.append(cv2.add(frame, rng.integers(0, 24, (height, width, 3), dtype=np.uint8)))
+    return frames
+
+
+def synthetic_faces(people: int, samples: int, seed: int = 0) -> list[np.ndarray]:
+    """Return ``people`` arrays of ``samples`` 200x200 crops, each person a distinct noisy pattern."""
+    rng = np.random.default_rng(seed)
+    dataset = []
+    for _ in range(people):
+        base = cv2.resize(rng.integers(0, 256, (20, 20), dtype=np.uint8), FACE_SIZE, interpolation=cv2.INTER_CUBIC)
+        noise = rng.normal(0, 12, (samples, *FACE_SIZE[::-1]))
+        dataset.append(np.clip(base + noise, 0, 255).astype(np.uint8))
+    return dataset
+
+
+def make_person(dataset_dir: Path, name: str, faces: np.ndarray) -> None:
+    """Write ``faces`` as a person's images plus an up-to-date crop store."""
+    person_dir = dataset_dir / name
+    person_dir.mkdir(parents=True, exist_ok=True)
+    for i, face in enumerate(faces):
+        cv2.imwrite(str(person_dir / f"{name}_{i}.jpg"), face)
+    save_faces(person_dir, faces)
+
+
+def load_frames(frames_dir: Path | None) -> list[np.ndarray]:
+    """Return recorded frames from ``frames_dir``, or synthetic ones if no directory is given."""
+    if frames_dir is None:
+        return synthetic_frames(FRAME_COUNT)
+    source = ReplaySource(frames_dir, fps=0, loop=False)
+    source.open()
+    return list(source._frames)  # noqa: SLF001
+
+
+class CenterFaceDetector:
+    """Stand-in detector reporting one face in the middle of every frame."""
+
+    def detect(self, gray: np.ndarray) -> np.ndarray:
+        """Return a single centered box a third of the frame height tall."""
+        height, width = gray.shape[:2]
+        side = height // 3
+        return np.array([[(width - side) // 2, (height - side) // 2, side, side]], dtype=np.int32)
+
+
+def time_update(samples: int, repeat: int) -> float:
+    """Time update_model adding a newcomer to a model trained on the current dataset without them."""
+    newcomer_dir = recognize.DATASET_DIR / "newcomer"
+    newcomer = synthetic_faces(1, samples, seed=1)[0]
+    models = []
+
+    def train_without_newcomer() -> None:
+        shutil.rmtree(newcomer_dir, ignore_errors=True)
+        models.append(recognize.train_model())
+        make_person(recognize.DATASET_DIR, "newcomer", newcomer)
+
+    return timed(lambda: recognize.update_model("newcomer", models.pop()), repeat, setup=train_without_newcomer)
+
+
+# ---------- Benchmarks ---------- #
+def bench_detect(context: SimpleNamespace) -> dict[str, float]:
+    """Time FaceDetector (cascade detectMultiScale) at full and configured resolution."""
+    try:
+        full, scaled = FaceDetector(scale=1.0), FaceDetector()
+    except FileNotFoundError as e:
+        raise SkipBenchmarkError(str(e)) from e
+
+    grays = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in context.frames]
+    return {
+        "detect.full_resolution_ms": timed(lambda: [full.detect(g) for g in grays], context.repeat) / len(grays),
+        "detect.scaled_ms": timed(lambda: [scaled.detect(g) for g in grays], context.repeat) / len(grays),
+    }
+
+
+def bench_predict(context: SimpleNamespace) -> dict[str, float]:
+    """Time single and batched predictions for each backend that can be created."""
+    dataset = synthetic_faces(5, 20)
+    faces = np.concatenate(dataset)
+    labels = np.repeat(np.arange(len(dataset), dtype=np.int32), 20)
+    queries = faces[::25][:4]
+
+    results = {}
+    for name in ("lbph", "sface"):
+        try:
+            backend = get_backend(name)
+        except FileNotFoundError:
+            logger.info("  %s backend unavailable, skipping", name)
+            continue
+        backend.train(faces, labels)
+        results[f"predict.{name}_ms"] = timed(partial(backend.predict, queries[0]), context.repeat * 10)
+        results[f"predict.{name}_batch{len(queries)}_ms"] = timed(
+            partial(backend.predict_batch, queries), context.repeat * 10,
+        )
+    return results
+
+
+def bench_train(context: SimpleNamespace) -> dict[str, float]:
+    """Time train_model at each dataset size, then update_model adding one more person to the trained model."""
+    results = {}
+    for people, samples in context.train_sizes:
+        with tempfile.TemporaryDirectory() as tmp, working_directory(Path(tmp)):
+            for index, faces in enumerate(synthetic_faces(people, samples)):
+                make_person(recognize.DATASET_DIR, f"person{index}", faces)
+            results[f"train.{people}x{samples}_ms"] = timed(recognize.train_model, context.repeat)
+            results[f"update.{people}x{samples}_plus_one_ms"] = time_update(samples, context.repeat)
+    return results
+
+
+def bench_register(context: SimpleNamespace) -> dict[str, float]:
+    """Time register_person collecting NUM_SAMPLES samples from replayed frames."""
+    with tempfile.TemporaryDirectory() as tmp, working_directory(Path(tmp)):
+        frames_dir = Path(tmp) / "frames"
+        frames_dir.mkdir()
+        frames = context.frames if context.recorded else synthetic_frames(NUM_SAMPLES * 2, seed=2)
+        for i, frame in enumerate(frames):
+            cv2.imwrite(str(frames_dir / f"{i:05d}.jpg"), frame)
+
+        window = SimpleNamespace(write_event_value=lambda *_: None)
+        start = time.perf_counter()
+        try:
+            register.register_person(
+                window, "benchmark",
+                timeout=REGISTER_TIMEOUT,
+                camera=ReplaySource(frames_dir, fps=0),
+                face_detector=None if context.recorded else CenterFaceDetector(),
+            )
+        except (FileNotFoundError, register.EnrollmentStoppedError) as e:
+            raise SkipBenchmarkError(str(e)) from e
+        elapsed = 1000 * (time.perf_counter() - start)
+    return {"register.total_ms": elapsed, "register.per_sample_ms": elapsed / NUM_SAMPLES}
+
+
+def bench_weather(context: SimpleNamespace) -> dict[str, float]:
+    """Time fetching and parsing the recorded response, and formatting the rows the GUI shows.
+
+    Every fetch gets a fresh in-memory cache, so each one makes a real HTTP
+    request to the local server instead of being answered from the cache.
+    """
+    # Imported here so the vision benchmarks run without the weather stack installed
+    import weather  # noqa: PLC0415
+    from benchmarks.make_weather_fixture import FIXTURE_FILE, FIXTURE_LOCATIONS  # noqa: PLC0415
+
+    if not FIXTURE_FILE.exists():
+        msg = f"{FIXTURE_FILE} missing, run python -m benchmarks.make_weather_fixture"
+        raise SkipBenchmarkError(msg)
+    body = FIXTURE_FILE.read_bytes()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_: Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    locations = [
+        {"name": name, "latitude": latitude, "longitude": longitude, "timezone": timezone}
+        for name, latitude, longitude, timezone, _ in FIXTURE_LOCATIONS
+    ]
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/v1/forecast"
+
+        def fetch() -> list[tuple]:
+            return weather.get_weather_data(weather.WeatherClient(url=url, backend="memory"), locations)
+
+        def render() -> None:
+            for daily, hourly, _ in fetch():
+                daily[:7]
+                hourly[:24]
+
+        fetch()  # warm up the server and imports
+        return {
+            "weather.fetch_and_parse_ms": timed(fetch, context.repeat * 10),
+            "weather.fetch_parse_and_format_ms": timed(render, context.repeat * 10),
+        }
+    finally:
+        server.shutdown()
+
+
+BENCHMARKS: dict[str, Callable[[SimpleNamespace], dict[str, float]]] = {
+    "detect": bench_detect,
+    "predict": bench_predict,
+    "train": bench_train,
+    "register": bench_register,
+    "weather": bench_weather,
+}
+
+
+# ---------- Commands ---------- #
+def run(args: argparse.Namespace) -> None:
+    """Run the selected benchmarks and write their results as JSON."""
+    context = SimpleNamespace(
+        frames=load_frames(args.frames),
+        recorded=args.frames is not None,
+        repeat=args.repeat,
+        train_sizes=QUICK_TRAIN_SIZES if args.quick else TRAIN_SIZES,
+    )
+    results: dict[str, float] = {}
+    skipped: dict[str, str] = {}
+    for name in args.only or BENCHMARKS:
+        logger.info("Running %s...", name)
+        try:
+            metrics = BENCHMARKS[name](context)
+        except SkipBenchmarkError as e:
+            logger.info("  skipped: %s", e)
+            skipped[name] = str(e)
+            continue
+        for metric, value in metrics.items():
+            logger.info("  %-40s %10.3f ms", metric, value)
+        results.update(metrics)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "frames": str(args.frames) if args.frames else "synthetic",
+            "quick": args.quick,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    logger.info("Wrote %s", args.output)
+
+
+def compare(args: argparse.Namespace) -> None:
+    """Report each metric against the baseline and exit with 1 if any regressed."""
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    current = json.loads(args.current.read_text(encoding="utf-8"))["results"]
+
+    regressions = 0
+    logger.info("%-40s %12s %12s %8s", "metric", "baseline ms", "current ms", "change")
+    for metric in sorted(baseline.keys() | current.keys()):
+        if metric not in current or metric not in baseline:
+            where = "baseline" if metric in baseline else "current run"
+            logger.info("%-40s only in %s", metric, where)
+            continue
+        old, new = baseline[metric], current[metric]
+        change = (new - old) / old if old else 0.0
+        regressed = change > args.tolerance and new - old > MIN_REGRESSION_MS
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        logger.info("%-40s %12.3f %12.3f %+7.0f%%%s", metric, old, new, 100 * change, flag)
+
+    if regressions:
+        logger.info("%d metric(s) regressed by more than %.0f%%", regressions, 100 * args.tolerance)
+        sys.exit(1)
+    logger.info("No regressions")
+
+
+def main() -> None:
+    """Parse the command line and run ``run`` or ``compare``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    run_parser.add_argument("--frames", type=Path, help="directory of recorded frames instead of synthetic ones")
+    run_parser.add_argument("--repeat", type=int, default=5, help="runs per measurement, the median is kept")
+    run_parser.add_argument("--quick", action="store_true", help="train on smaller datasets only")
+    run_parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="benchmarks to run, default all")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Keep the per-step logging of the code under test out of the report
+    for name in ("facial_recognition", "weather"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    main()
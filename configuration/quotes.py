@@ -1,137 +0,0 @@
-"""Quotes to Display daily and for user when recognized."""
-my_quotes = [
-    "You are in the Maze, there is no escape, welcome to madness",
-    "When the bullet hits your skull what will it matter why",
-    "Fear is the mind killer",
-    "The night is dark and full of terrors",
-]
-
-
-sexist_jokes = [
-    "How many sexists does it take to change a light bulb? None, let the b*tch cook in the dark.",
-    "Why do men find it difficult to make eye contact? Breasts don't have eyes.",
-    "What do you say to a woman with 2 black eyes? Nothing, she's been told twice already.",
-]
-
-racist_jokes = [
-    "How do you know the first man Adam was not black? I've never heard of a black man giving up any of his ribs",
-    "How does every racist joke start? \t With a look over your shoulder.",
-    ("Did you hear that the police are looking for a racist assaulter? My friend called but apparently,"
-     "it wasn't a job notice."),
-    "What do you call a blind racist? \t A Not-see.",
-    ("Did you hear about a blackout in the neighborhood last night? The police told the people to stay in their houses"
-    "until they'd shot him."),
-    ("Did you hear about the man who was called racist for saying “black paint”? Apparently, the politically correct"
-     "term is “Tyrone, please paint the fence.”"),
-    "What does a dyslexic racist hate? \t gingers.",
-    "What's the worst part about being a black Jew? They make you stand in the back of the oven.",
-    "How many police officers does it take to change a light bulb? None, they just beat the room for being black.",
-    "What is the shiniest part of a black man? The handcuffs.",
-    "Why is the ocean floor so dark? Because black people can't swim.",
-    "What is the whitest thing about a black guy? His owner.",
-    "How do you tell when a black guy has been on your computer? It's gone.",
-    "Why do black men cry after sex? The pepper spray.",
-    "why do all black people have nightmares only? Because the only one who had a dream got shot",
-    "What's the difference between a Jew and a canoe? Canoes tip.",
-    "why can't stevie wonder read? because he is black",
-    "What's the difference between Jews and boyscouts? Boyscouts come back from camp.",
-]
-
-quotes = [
-    "Believe you can and you're halfway there. - Theodore Roosevelt",
-    "The only way to do great work is to love what you do. - Steve Jobs",
-    "Don't watch the clock; do what it does. Keep going. - Sam Levenson",
-    "You are never too old to set another goal or to dream a new dream. - C.S. Lewis",
-    "Success is not final, failure is not fatal: It is the courage to continue that counts. - Winston Churchill",
-    "The harder you work for something, the greater you'll feel when you achieve it.",
-    "Don't stop when you're tired. Stop when you're done.",
-    "Little things make big days.",
-    "Push yourself, because no one else is going to do it for you.",
-    "The key to success is to focus on goals, not obstacles.",
-    "The secret of getting ahead is getting started. - Mark Twain",
-    "The best time to plant a tree was 20 years ago. The second best time is now.",
-    "Hardships often prepare ordinary people for an extraordinary destiny. - C.S. Lewis",
-    "Sometimes later becomes never. Do it now.",
-    "Wake up with determination. Go to bed with satisfaction.",
-    "Do something today that your future self will thank you for.",
-    "Don't quit. Suffer now and live the rest of your life as a champion. - Muhammad Ali",
-    "The only limit to our realization of tomorrow will be our doubts of today. - Franklin D. Roosevelt",
-    "You don't have to be great to start, but you have to start to be great.",
-    "The future depends on what you do today. - Mahatma Gandhi",
-    "It does not matter how slowly you go as long as you do not stop. - Confucius",
-    "Success is what happens after you have survived all your mistakes.",
-    "Be so good they can't ignore you. - Steve Martin",
-    "If it doesn't challenge you, it won't change you.",
-    "Do what you can with all you have, wherever you are. - Theodore Roosevelt",
-    "The best revenge is massive success. - Frank Sinatra",
-    "Doubt kills more dreams than failure ever will.",
-    "Fall seven times and stand up eight. - Japanese Proverb",
-    "Everything you've ever wanted is on the other side of fear. - George Addair",
-    "You don't have to see the whole staircase, just take the first step. - Martin Luther King Jr.",
-    "If opportunity doesn't knock, build a door. - Milton Berle",
-    "Success is not in what you have, but who you are. - Bo Bennett",
-    "Act as if what you do makes a difference. It does. - William James",
-    "Don't count the days, make the days count. - Muhammad Ali",
-    "Everything you can imagine is real. - Pablo Picasso",
-    "Success usually comes to those who are too busy to be looking for it. - Henry David Thoreau",
-    "Don't let yesterday take up too much of today. - Will Rogers",
-    "Motivation is what gets you started. Habit is what keeps you going. - Jim Ryun",
-    "It always seems impossible until it's done. - Nelson Mandela",
-    "Don't wait. The time will never be just right. - Napoleon Hill",
-]
-
-dad_jokes = [
-    "Why did the scarecrow win an award? Because he was outstanding in his field!",
-    "Why don't skeletons fight each other? They don't have the guts.",
-    "Want to hear a joke about construction? I'm still working on it.",
-    "I used to play piano by ear, but now I use my hands.",
-    "I only know 25 letters of the alphabet. I don't know y.",
-    "Why did the math book look sad? Because it had too many problems.",
-    "I asked the librarian if the library had any books on paranoia. She whispered, 'They're right behind you.'",
-    "Why did the coffee file a police report? It got mugged.",
-    "How do you organize a space party? You planet.",
-    "Why did the bicycle fall over? Because it was two-tired!",
-    "Why can't your nose be 12 inches long? Because then it would be a foot.",
-    "Why did the golfer bring extra pants? In case he got a hole in one.",
-    "Why do cows have hooves instead of feet? Because they lactose.",
-    "Why don't oysters donate to charity? Because they are shellfish.",
-    "What do you call fake spaghetti? An impasta!",
-    "I would tell you a joke about time travel, but you didn't like it.",
-    "Why did the stadium get hot after the game? All of the fans left.",
-    "I told my wife she was drawing her eyebrows too high. She looked surprised.",
-    "Why don't eggs tell jokes? They'd crack each other up.",
-    "I don't trust stairs. They're always up to something.",
-    "Did you hear about the restaurant on the moon? Great food, no atmosphere.",
-    "Why do seagulls fly over the ocean? Because if they flew over the bay, they'd be bagels.",
-    "I used to have a fear of hurdles, but I got over it.",
-    "Why was the broom late? It swept in.",
-    "I told a joke about a roof once… it went over everyone's head.",
-    "Why did the picture go to jail? Because it was framed.",
-    "Don't challenge Death to a pillow fight. Unless you're prepared for the reaper cushions.",
-    "I threw a boomerang a couple of years ago. I know live in constant fear.",
-    "Why couldn't the bank keep any secrets? It had too many tellers!",
-    "Why don't you ever see elephants hiding in trees? Because they're so good at it.",
-    ("Today, my son asked 'Can I have a bookmark?' and I burst into tears."
-    "11 years old and he still doesn't know my name is Brian."),
-    "Did you hear the one about the dog and the tree? They had a long conversation about bark.",
-    "“Don't screw around,” he said while holding a screwdriver.",
-]
-
-
-dark_humor = [
-    ("A man goes to the library and asks for a book on suicide. The librarian says,"
-    "'Fuck off, you won't bring it back.'"),
-    "If we had mosquito nets in Africa we could save millions of mosquitos from getting AIDS.",
-    "What do guitarists and priests have in common? They're both really good at fingering A Minor",
-    "If I ever saw an amputee being hanged, I'd start yelling out letters.",
-    "Faggot.",
-    "Ha. You're Gay!",
-    "Only one of us is gay and I'm a mirror so...",
-    "Look away please I can't handle this level ugly."
-    "If I was in a room with Hitler, Stalin and you and only had 2 bullets in my gun I would shoot you twice.",
-]
-
-
-nice_quotes = [
-    "You are Beautiful.",
-]
@@ -1,3 +1,6 @@
-"""Module to hold recognition records."""
+"""Module to hold recognition records.
+
+Only read to migrate preferences from before preferences.json existed.
+"""
 
 records: dict[str, list[str]] = {}
@@ -1,20 +1,88 @@
 """Settings for the Smart Mirror."""
 
 import os
-
-import FreeSimpleGUI as Sg  # type: ignore[import]
+from functools import cache
+from pathlib import Path
+from typing import Any
 
 os.environ["DISPLAY"] = ":0.0"
 FONT = "Helvetica"
 DATE_TXT_SIZE = 30
 QUOTE_TXT_SIZE = 30
 GREETING_TXT_SIZE = 60
-WINDOW_WIDTH = Sg.Window.get_screen_size()[0]
-WINDOW_HEIGHT = Sg.Window.get_screen_size()[1]
 BACKGROUND_COLOR = "black"
 TEXT_COLOR = "white"
+# WINDOW_WIDTH and WINDOW_HEIGHT come from the screen on first use, see __getattr__ at the bottom
 UPDATE_INTERVAL = 600  # 10 minutes in seconds
 TIMEZONE = "US/Eastern"
+PROMPT_TIMEOUT = 120  # seconds without a key press before an open prompt is closed
+QUOTE_HISTORY = 20  # recent picks per category that are made less likely to repeat, 0 for no penalty
+QUOTE_REPEAT_PENALTY = 0.3  # weight multiplier for each time an entry appears in that history
+CONTENT_DIR = Path(__file__).resolve().parent.parent / "content"  # <language>/<category>.txt files
+CONTENT_LANGUAGE = "en"  # subdirectory of CONTENT_DIR to read quotes and jokes from
+# Categories listed first, in this order, when choosing content; others found on disk follow
+CONTENT_MENU = ["racist_jokes", "sexist_jokes", "dad_jokes", "dark_humor", "my_quotes"]
+PREFERENCES_FILE = Path("preferences.json")  # what content each registered person wants to see
 NUM_SAMPLES = 50  # number of images per person
 RECOGNITION_THRESHOLD = 120  # lower is more strict
 DETECTION_THRESHOLD = 5  # number of consecutive detections to no longer recognize
+CAMERA_SOURCE = "rpicam"  # "rpicam", "v4l2:<device>" or a directory of images to replay
+CAMERA_RESOLUTION = (1280, 960)  # width, height of streamed frames
+CAMERA_FPS = 10  # frames per second requested from the camera
+PIPELINE_QUEUE_SIZE = 1  # frames buffered between pipeline stages, older frames are dropped
+PIPELINE_STATS_INTERVAL = 60  # seconds between pipeline queue/drop stats log lines
+MOTION_SENSITIVITY = 0.01  # fraction of pixels that must change before face detection runs
+MOTION_PIXEL_THRESHOLD = 25  # per-pixel brightness change (0-255) that counts as changed
+MOTION_FRAME_WIDTH = 160  # width frames are downscaled to for motion detection
+MOTION_HOLD_TIME = 3.0  # seconds to keep detecting after the last motion
+MOTION_IDLE_AFTER = 30.0  # seconds without motion before dropping to the idle polling rate
+IDLE_POLL_INTERVAL = 1.0  # seconds between frames checked while idle
+DETECTION_SCALE = 0.5  # fraction of camera resolution the face detector runs at
+CAMERA_HFOV_DEGREES = 66  # horizontal field of view of the camera lens
+MAX_FACE_DISTANCE_METERS = 1.5  # furthest distance from the mirror a face should be detected
+FACE_WIDTH_METERS = 0.15  # typical width of a face, used to size the smallest detection
+TRACK_IOU_THRESHOLD = 0.3  # minimum box overlap to treat detections in two frames as the same face
+TRACK_MAX_MISSES = 10  # frames a face can go undetected before its track is dropped
+TRACK_RETRY_FRAMES = 3  # frames between predictions for a face that is not yet recognized
+TRACK_REVERIFY_FRAMES = 30  # frames between predictions for a face that is already recognized
+TRAIN_WORKERS = os.cpu_count() or 1  # threads used to decode and crop images when retraining
+REGISTER_MIN_DIFFERENCE = 6.0  # mean pixel difference (0-255) a new sample needs from every kept one
+REGISTER_TIMEOUT = 120  # seconds to collect NUM_SAMPLES samples before enrollment gives up
+RECOGNIZER_BACKEND = "lbph"  # "lbph" or "sface"
+SFACE_MODEL = "models/face_recognition_sface_2021dec.onnx"  # OpenCV Zoo SFace model for the sface backend
+YUNET_MODEL = "models/face_detection_yunet_2023mar.onnx"  # optional, aligns faces for the sface backend
+SFACE_DISTANCE_THRESHOLD = 0.64  # cosine distance (1 - similarity), lower is more strict
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast"  # Open-Meteo forecast endpoint
+WEATHER_UNITS = "imperial"  # "imperial" or "metric"
+# Places to show weather for, all fetched in one request; the first fills the main panel
+WEATHER_LOCATIONS = [
+    {"name": "Home", "latitude": 42.48948, "longitude": -83.14465, "timezone": "America/New_York"},
+]
+WEATHER_JITTER = 0.1  # fraction of UPDATE_INTERVAL each weather refresh is randomly moved by
+WEATHER_RETRY_INTERVAL = 60  # seconds before retrying after a failed weather fetch
+WEATHER_CACHE_BACKEND = "sqlite"  # weather response cache: "memory", "sqlite" or "filesystem"
+WEATHER_CACHE_NAME = ".cache"  # file or directory name for the sqlite/filesystem weather cache
+WEATHER_SNAPSHOT_FILE = Path("weather_snapshot.json")  # last good weather, shown at startup before the first fetch
+WEATHER_STALE_AFTER = 3600  # seconds after which displayed weather is marked as out of date
+METRICS_ENABLED = False  # record latency histograms and counters for the metrics endpoint/dump
+METRICS_PORT = 9108  # localhost port serving /metrics (Prometheus text) and /metrics.json, 0 for none
+METRICS_DUMP_FILE = Path("metrics.json")  # where metrics are written periodically as JSON
+METRICS_DUMP_INTERVAL = 0  # seconds between writes of METRICS_DUMP_FILE, 0 for none
+
+
+@cache
+def screen_size() -> tuple[int, int]:
+    """Return the screen's (width, height), asking the display only the first time."""
+    import FreeSimpleGUI as Sg  # type: ignore[import]  # noqa: PLC0415 - keeps settings importable headless
+
+    return Sg.Window.get_screen_size()
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve WINDOW_WIDTH and WINDOW_HEIGHT on first use so importing settings never probes the display."""
+    if name == "WINDOW_WIDTH":
+        return screen_size()[0]
+    if name == "WINDOW_HEIGHT":
+        return screen_size()[1]
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
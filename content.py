@@ -0,0 +1,138 @@
+"""Quotes and jokes read straight from memory-mapped text files.
+
+Each category is a UTF-8 text file in ``CONTENT_DIR / CONTENT_LANGUAGE`` with
+one entry per line; blank lines are skipped. Next to it an ``.idx`` file holds
+the byte offset of every entry as little-endian uint64s, so an entry is found
+by reading one offset and slicing the mapped text, whatever the size of the
+corpus. Dropping a new ``<category>.txt`` into the directory adds a category.
+"""
+
+import logging
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO
+
+from configuration.settings import CONTENT_DIR, CONTENT_LANGUAGE
+
+logger = logging.getLogger(__name__)
+
+OFFSET = struct.Struct("<Q")
+
+# Offsets written to the index per chunk while building it
+INDEX_CHUNK = 65536
+
+
+def build_index(text_file: Path, index_file: Path) -> int:
+    """Write the offset of every non-blank line in ``text_file`` to ``index_file``.
+
+    The text is scanned through a memory map and offsets are written in chunks,
+    so building the index takes constant memory. Returns the number of entries.
+    """
+    count = 0
+    tmp = index_file.with_suffix(".idx.tmp")
+    with text_file.open("rb") as text, tmp.open("wb") as out:
+        size = text_file.stat().st_size
+        if size:
+            with mmap.mmap(text.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offsets = array("Q")
+                start = 0
+                while start < size:
+                    end = mm.find(b"\n", start)
+                    end = size if end == -1 else end
+                    if mm[start:end].strip():
+                        offsets.append(start)
+                    start = end + 1
+                    if len(offsets) >= INDEX_CHUNK:
+                        count += _write_offsets(out, offsets)
+                count += _write_offsets(out, offsets)
+    tmp.replace(index_file)
+    logger.info("Indexed %d entries in %s", count, text_file)
+    return count
+
+
+def _write_offsets(out: BinaryIO, offsets: array) -> int:
+    """Write ``offsets`` little-endian, empty the array and return how many were written."""
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    offsets.tofile(out)
+    written = len(offsets)
+    del offsets[:]
+    return written
+
+
+class Corpus:
+    """One category: a memory-mapped text file and its offset index."""
+
+    def __init__(self, text_file: Path) -> None:
+        """Map ``text_file``, (re)building its index first if missing or older than the text."""
+        self.text_file = text_file
+        self.index_file = text_file.with_suffix(".idx")
+        if not self.index_file.exists() or self.index_file.stat().st_mtime < text_file.stat().st_mtime:
+            build_index(text_file, self.index_file)
+
+        self.text = self._map(text_file)
+        self.index = self._map(self.index_file)
+        self._length = len(self.index) // OFFSET.size if self.index is not None else 0
+
+    @staticmethod
+    def _map(path: Path) -> mmap.mmap | None:
+        """Map ``path`` read-only, or return None for an empty file (which cannot be mapped)."""
+        if not path.stat().st_size:
+            return None
+        with path.open("rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return self._length
+
+    def __getitem__(self, index: int) -> str:
+        """Return entry ``index`` without reading any other entry."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length or self.index is None or self.text is None:
+            raise IndexError(index)
+        (start,) = OFFSET.unpack_from(self.index, index * OFFSET.size)
+        end = self.text.find(b"\n", start)
+        return self.text[start:end if end != -1 else len(self.text)].decode("utf-8").strip()
+
+    def close(self) -> None:
+        """Unmap both files."""
+        for mapped in (self.text, self.index):
+            if mapped is not None:
+                mapped.close()
+
+
+class ContentStore:
+    """Every category in a content directory, each opened the first time it is used."""
+
+    def __init__(self, directory: Path = CONTENT_DIR / CONTENT_LANGUAGE) -> None:
+        """Look for ``<category>.txt`` files in ``directory``."""
+        self.directory = directory
+        self.corpora: dict[str, Corpus] = {}
+
+    def categories(self) -> list[str]:
+        """Return the names of all categories, sorted."""
+        return sorted(path.stem for path in self.directory.glob("*.txt"))
+
+    def __contains__(self, category: object) -> bool:
+        """Return True if ``category`` has a text file."""
+        return isinstance(category, str) and (self.directory / f"{category}.txt").is_file()
+
+    def __getitem__(self, category: str) -> Corpus:
+        """Return the corpus for ``category``, opening it on first use."""
+        if category not in self.corpora:
+            if category not in self:
+                raise KeyError(category)
+            self.corpora[category] = Corpus(self.directory / f"{category}.txt")
+        return self.corpora[category]
+
+    def get(self, category: str) -> Corpus | None:
+        """Return the corpus for ``category``, or None if there is no such category."""
+        try:
+            return self[category]
+        except KeyError:
+            return None
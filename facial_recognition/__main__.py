@@ -0,0 +1,31 @@
+"""Command line maintenance for the face recognition model.
+
+Usage:
+    python -m facial_recognition rebuild        Retrain the model from the whole dataset
+    python -m facial_recognition update <name>  Add one person's samples to the existing model
+"""
+
+import argparse
+import logging
+
+from facial_recognition.recognize import train_model, update_model
+
+
+def main() -> None:
+    """Parse arguments and run the requested command."""
+    parser = argparse.ArgumentParser(prog="python -m facial_recognition", description="Manage the face model.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="retrain the model from every person in the dataset")
+    update = commands.add_parser("update", help="add one person's samples to the existing model")
+    update.add_argument("name")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        train_model()
+    else:
+        update_model(args.name)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,179 @@
+"""Interchangeable face recognizer backends.
+
+Every backend takes 200x200 grayscale face crops and predicts ``(label, distance)``
+where a lower distance is a better match, so callers can compare it against the
+backend's ``threshold`` without knowing which backend is in use.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+import cv2  # type: ignore[import]
+import numpy as np  # type: ignore[import]
+
+from configuration.settings import (
+    RECOGNITION_THRESHOLD,
+    RECOGNIZER_BACKEND,
+    SFACE_DISTANCE_THRESHOLD,
+    SFACE_MODEL,
+    YUNET_MODEL,
+)
+
+TRAINER_FILE = Path("trainer.yml")
+EMBEDDINGS_FILE = Path("embeddings.npz")
+
+
+class RecognizerBackend(ABC):
+    """Interface shared by all recognizer backends."""
+
+    model_file: Path
+    threshold: float
+
+    def exists(self) -> bool:
+        """Return True if a trained model has been saved."""
+        return self.model_file.exists()
+
+    @abstractmethod
+    def train(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Replace the model with one trained on ``faces`` and ``labels``."""
+
+    @abstractmethod
+    def update(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Add ``faces`` and ``labels`` to the loaded model."""
+
+    @abstractmethod
+    def predict(self, face: np.ndarray) -> tuple[int, float]:
+        """Return the best matching label and its distance for one face."""
+
+    def predict_batch(self, faces: np.ndarray) -> list[tuple[int, float]]:
+        """Return ``(label, distance)`` for every face in an N x 200 x 200 array."""
+        return [self.predict(face) for face in faces]
+
+    @abstractmethod
+    def load(self) -> None:
+        """Read the model from ``model_file``."""
+
+    @abstractmethod
+    def save(self) -> None:
+        """Write the model to ``model_file``."""
+
+
+class LBPHBackend(RecognizerBackend):
+    """OpenCV's Local Binary Pattern Histogram recognizer."""
+
+    model_file = TRAINER_FILE
+    threshold = RECOGNITION_THRESHOLD
+
+    def __init__(self) -> None:
+        """Create an untrained LBPH recognizer."""
+        self.recognizer = cv2.face.LBPHFaceRecognizer_create()  # type: ignore[attr-defined]
+
+    def train(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Train LBPH from scratch."""
+        self.recognizer.train(list(faces), labels)
+
+    def update(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Append histograms for new samples without retraining the rest."""
+        self.recognizer.update(list(faces), labels)
+
+    def predict(self, face: np.ndarray) -> tuple[int, float]:
+        """Return the nearest label and its LBPH distance."""
+        label, distance = self.recognizer.predict(face)
+        return int(label), float(distance)
+
+    def load(self) -> None:
+        """Read trainer.yml."""
+        self.recognizer.read(str(self.model_file))
+
+    def save(self) -> None:
+        """Write trainer.yml."""
+        self.recognizer.save(str(self.model_file))
+
+
+class SFaceBackend(RecognizerBackend):
+    """SFace embeddings matched by cosine similarity.
+
+    Each sample is stored as one normalized 128-d vector, so a prediction is a
+    single matrix-vector product over every enrolled sample. When a YuNet model
+    is available it supplies landmarks to align the face before embedding.
+    """
+
+    model_file = EMBEDDINGS_FILE
+    threshold = SFACE_DISTANCE_THRESHOLD
+
+    def __init__(self) -> None:
+        """Load the SFace network and, if present, the YuNet landmark detector."""
+        if not Path(SFACE_MODEL).exists():
+            msg = f"SFace model not found at {SFACE_MODEL}"
+            raise FileNotFoundError(msg)
+        self.sface = cv2.FaceRecognizerSF.create(SFACE_MODEL, "")
+        self.yunet = None
+        if Path(YUNET_MODEL).exists():
+            self.yunet = cv2.FaceDetectorYN.create(YUNET_MODEL, "", (200, 200))
+        self.vectors = np.empty((0, 128), dtype=np.float32)
+        self.labels = np.empty(0, dtype=np.int32)
+
+    def embed(self, face: np.ndarray) -> np.ndarray:
+        """Return the unit-length embedding of one grayscale face crop."""
+        bgr = cv2.cvtColor(face, cv2.COLOR_GRAY2BGR)
+        aligned: Any = None
+        if self.yunet is not None:
+            self.yunet.setInputSize((bgr.shape[1], bgr.shape[0]))
+            _, detections = self.yunet.detect(bgr)
+            if detections is not None:
+                aligned = self.sface.alignCrop(bgr, detections[0])
+        if aligned is None:
+            aligned = cv2.resize(bgr, (112, 112), interpolation=cv2.INTER_AREA)
+        vector = self.sface.feature(aligned).reshape(-1).astype(np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def train(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Embed every sample, replacing any existing vectors."""
+        self.vectors = np.empty((0, 128), dtype=np.float32)
+        self.labels = np.empty(0, dtype=np.int32)
+        self.update(faces, labels)
+
+    def update(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Embed new samples and append them to the stored vectors."""
+        new = np.stack([self.embed(face) for face in faces]) if len(faces) else self.vectors[:0]
+        self.vectors = np.vstack((self.vectors, new))
+        self.labels = np.concatenate((self.labels, np.asarray(labels, dtype=np.int32)))
+
+    def predict(self, face: np.ndarray) -> tuple[int, float]:
+        """Return the most similar sample's label and its cosine distance."""
+        return self.predict_batch(face[np.newaxis])[0]
+
+    def predict_batch(self, faces: np.ndarray) -> list[tuple[int, float]]:
+        """Score every face against every stored sample in one matrix product."""
+        if not len(self.vectors):
+            return [(-1, float("inf"))] * len(faces)
+        queries = np.stack([self.embed(face) for face in faces])
+        similarity = queries @ self.vectors.T
+        best = np.argmax(similarity, axis=1)
+        distances = 1.0 - similarity[np.arange(len(faces)), best]
+        return [(int(self.labels[b]), float(d)) for b, d in zip(best, distances, strict=True)]
+
+    def load(self) -> None:
+        """Read embeddings.npz."""
+        with np.load(self.model_file) as data:
+            self.vectors = data["vectors"]
+            self.labels = data["labels"]
+
+    def save(self) -> None:
+        """Write embeddings.npz."""
+        np.savez(self.model_file, vectors=self.vectors, labels=self.labels)
+
+
+BACKENDS: dict[str, type[RecognizerBackend]] = {
+    "lbph": LBPHBackend,
+    "sface": SFaceBackend,
+}
+
+
+def get_backend(name: str = RECOGNIZER_BACKEND) -> RecognizerBackend:
+    """Create the recognizer backend configured in settings."""
+    if name not in BACKENDS:
+        msg = f"Unknown recognizer backend {name!r}, expected one of {sorted(BACKENDS)}"
+        raise ValueError(msg)
+    return BACKENDS[name]()
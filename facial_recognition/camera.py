@@ -0,0 +1,280 @@
+"""Long-lived camera frame sources that deliver decoded frames from memory."""
+
+import logging
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Self
+
+import cv2  # type: ignore[import]
+import numpy as np  # type: ignore[import]
+
+from configuration.settings import CAMERA_FPS, CAMERA_RESOLUTION, CAMERA_SOURCE, IDLE_POLL_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+JPEG_START = b"\xff\xd8"
+JPEG_END = b"\xff\xd9"
+READ_CHUNK = 64 * 1024
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class FrameSource(ABC):
+    """Base class for a camera that stays open between frames.
+
+    Use as a context manager, then call :meth:`read` for each new frame.
+    :meth:`set_idle` drops the source to one frame per ``IDLE_POLL_INTERVAL``
+    while nothing is happening in front of the mirror.
+    """
+
+    @abstractmethod
+    def open(self) -> None:
+        """Start the underlying device or process."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the underlying device or process."""
+
+    @abstractmethod
+    def read(self, timeout: float = 5.0) -> Any:
+        """Return the next BGR frame, or raise RuntimeError if none arrives in time."""
+
+    @abstractmethod
+    def set_idle(self, *, idle: bool) -> None:
+        """Switch between the configured frame rate and the idle polling rate."""
+
+    def __enter__(self) -> Self:
+        """Open the source."""
+        self.open()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close the source."""
+        self.close()
+
+
+class RpicamSource(FrameSource):
+    """Stream MJPEG from a single ``rpicam-vid`` process over a pipe.
+
+    A reader thread keeps only the most recent encoded frame, so a slow consumer
+    never builds a backlog and only frames that are actually used get decoded.
+    While idle, rpicam-vid is restarted at the idle polling rate so the camera
+    and encoder stop producing frames that would only be thrown away.
+    """
+
+    def __init__(self, resolution: tuple[int, int] = CAMERA_RESOLUTION, fps: int = CAMERA_FPS) -> None:
+        """Set capture size and frame rate."""
+        self.resolution = resolution
+        self.fps = fps
+        self.idle = False
+        self._process: subprocess.Popen[bytes] | None = None
+        self._reader: threading.Thread | None = None
+        self._condition = threading.Condition()
+        self._latest: bytes | None = None
+        self._sequence = 0
+        self._last_read = 0
+
+    def open(self) -> None:
+        """Launch rpicam-vid writing MJPEG to stdout."""
+        width, height = self.resolution
+        fps = 1.0 / IDLE_POLL_INTERVAL if self.idle else self.fps
+        self._process = subprocess.Popen(
+            [
+                "rpicam-vid", "-t", "0", "-n",
+                "--codec", "mjpeg",
+                "--width", str(width), "--height", str(height),
+                "--framerate", f"{fps:g}",
+                "-o", "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._reader = threading.Thread(target=self._read_stream, args=(self._process.stdout,), daemon=True)
+        self._reader.start()
+        logger.info("Started rpicam-vid stream at %dx%d @ %g fps", width, height, fps)
+
+    def close(self) -> None:
+        """Stop rpicam-vid and wake any waiting reader."""
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._reader is not None:
+            self._reader.join(timeout=1.0)
+            self._reader = None
+        with self._condition:
+            self._condition.notify_all()
+
+    def set_idle(self, *, idle: bool) -> None:
+        """Restart rpicam-vid at the idle polling rate, or back at full rate."""
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if self._process is not None:
+            self.close()
+            self.open()
+
+    def _read_stream(self, stream: IO[bytes] | None) -> None:
+        """Split the MJPEG byte stream into JPEG images, keeping the newest."""
+        if stream is None:
+            return
+        buffer = bytearray()
+        while chunk := stream.read1(READ_CHUNK):  # type: ignore[attr-defined]
+            buffer += chunk
+            end = buffer.rfind(JPEG_END)
+            if end == -1:
+                continue
+            start = buffer.rfind(JPEG_START, 0, end)
+            if start != -1:
+                with self._condition:
+                    self._latest = bytes(buffer[start:end + 2])
+                    self._sequence += 1
+                    self._condition.notify_all()
+            del buffer[:end + 2]
+        logger.info("rpicam-vid stream ended")
+
+    def read(self, timeout: float = 5.0) -> Any:
+        """Wait for a frame newer than the last one returned and decode it."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._sequence != self._last_read, timeout=timeout):
+                msg = "Timed out waiting for a frame from rpicam-vid"
+                raise RuntimeError(msg)
+            data, self._last_read = self._latest, self._sequence
+        if data is None:
+            msg = "rpicam-vid is not streaming, open the source first"
+            raise RuntimeError(msg)
+
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            msg = "Failed to decode frame from rpicam-vid"
+            raise RuntimeError(msg)
+        return frame
+
+
+class VideoCaptureSource(FrameSource):
+    """Read frames from a V4L2 device (or any source OpenCV can open)."""
+
+    def __init__(
+        self,
+        device: int | str = 0,
+        resolution: tuple[int, int] = CAMERA_RESOLUTION,
+        fps: int = CAMERA_FPS,
+    ) -> None:
+        """Set device, capture size and frame rate."""
+        self.device = device
+        self.resolution = resolution
+        self.fps = fps
+        self.idle = False
+        self._capture: Any = None
+        self._next_time = 0.0
+
+    def open(self) -> None:
+        """Open the capture device."""
+        self._capture = cv2.VideoCapture(self.device)
+        if not self._capture.isOpened():
+            msg = f"Could not open video device {self.device}"
+            raise RuntimeError(msg)
+        self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
+        self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
+        self._capture.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep the driver queue short so reads return a current frame
+        self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def close(self) -> None:
+        """Release the capture device."""
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+    def set_idle(self, *, idle: bool) -> None:
+        """Ask the driver for the idle polling rate (or the full rate) and pace reads to match.
+
+        V4L2 keeps streaming while the device is open, so this only saves power
+        on cameras whose driver honours the lower frame rate.
+        """
+        self.idle = idle
+        if self._capture is not None:
+            self._capture.set(cv2.CAP_PROP_FPS, 1.0 / IDLE_POLL_INTERVAL if idle else self.fps)
+        self._next_time = time.monotonic()
+
+    def read(self, timeout: float = 5.0) -> Any:  # noqa: ARG002
+        """Grab and decode the next frame from the device, no faster than the idle rate while idle."""
+        if self.idle:
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = time.monotonic() + IDLE_POLL_INTERVAL
+        ok, frame = self._capture.read()
+        if not ok or frame is None:
+            msg = f"Failed to read frame from video device {self.device}"
+            raise RuntimeError(msg)
+        return frame
+
+
+class ReplaySource(FrameSource):
+    """Replay still images from a directory in name order, for tests and benchmarks."""
+
+    def __init__(self, directory: Path, fps: float = CAMERA_FPS, *, loop: bool = True) -> None:
+        """Set directory to replay, playback rate and whether to loop."""
+        self.directory = directory
+        self.active_interval = 1.0 / fps if fps > 0 else 0.0
+        self.interval = self.active_interval
+        self.loop = loop
+        self._frames: list[Any] = []
+        self._index = 0
+        self._next_time = 0.0
+
+    def open(self) -> None:
+        """Decode every image in the directory once up front."""
+        files = sorted(p for p in self.directory.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        self._frames = [frame for frame in (cv2.imread(str(p)) for p in files) if frame is not None]
+        if not self._frames:
+            msg = f"No images to replay in {self.directory}"
+            raise RuntimeError(msg)
+        self._index = 0
+        self._next_time = time.monotonic()
+
+    def close(self) -> None:
+        """Drop the decoded images."""
+        self._frames = []
+
+    def set_idle(self, *, idle: bool) -> None:
+        """Replay one image per idle polling interval, or at the configured rate."""
+        self.interval = IDLE_POLL_INTERVAL if idle else self.active_interval
+        self._next_time = min(self._next_time, time.monotonic() + self.interval)
+
+    def read(self, timeout: float = 5.0) -> Any:  # noqa: ARG002
+        """Return the next image, paced to the configured frame rate."""
+        if self._index >= len(self._frames):
+            if not self.loop:
+                msg = "Replay finished"
+                raise RuntimeError(msg)
+            self._index = 0
+
+        delay = self._next_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_time = max(self._next_time, time.monotonic()) + self.interval
+
+        frame = self._frames[self._index]
+        self._index += 1
+        return frame
+
+
+def open_camera(source: str = CAMERA_SOURCE) -> FrameSource:
+    """Build the frame source described by ``source``.
+
+    ``"rpicam"`` streams from rpicam-vid, ``"v4l2:<n>"`` opens /dev/video<n>
+    through OpenCV and anything else is treated as a directory of images to replay.
+    """
+    if source == "rpicam":
+        return RpicamSource()
+    if source.startswith("v4l2:"):
+        device = source.removeprefix("v4l2:")
+        return VideoCaptureSource(int(device) if device.isdigit() else device)
+    return ReplaySource(Path(source))
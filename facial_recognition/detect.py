@@ -0,0 +1,101 @@
+"""Haar cascade face detection on a downscaled copy of the frame."""
+
+import math
+from pathlib import Path
+from typing import Any, Protocol
+
+import cv2  # type: ignore[import]
+import numpy as np  # type: ignore[import]
+
+from configuration.settings import (
+    CAMERA_HFOV_DEGREES,
+    DETECTION_SCALE,
+    FACE_WIDTH_METERS,
+    MAX_FACE_DISTANCE_METERS,
+)
+
+# Smallest window the default frontal face cascade was trained on
+CASCADE_WINDOW = 24
+
+
+def get_haar_cascade() -> cv2.CascadeClassifier:
+    """Return the frontal face Haar cascade."""
+    # Try default OpenCV path
+    possible = [
+        "/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml",
+        "/usr/share/opencv/haarcascades/haarcascade_frontalface_default.xml",
+    ]
+    # pip builds of OpenCV bundle the cascades with the package
+    if hasattr(cv2, "data"):
+        possible.append(str(Path(cv2.data.haarcascades) / "haarcascade_frontalface_default.xml"))
+    for path in possible:
+        if Path(path).exists():
+            return cv2.CascadeClassifier(str(path))
+    msg = "Could not find haarcascade_frontalface_default.xml on system"
+    raise FileNotFoundError(msg)
+
+
+def min_face_size(frame_width: int, scale: float = DETECTION_SCALE) -> int:
+    """Return the smallest face width in pixels, at ``scale``, worth detecting.
+
+    Based on how wide a face appears at ``MAX_FACE_DISTANCE_METERS`` through a
+    lens with ``CAMERA_HFOV_DEGREES`` horizontal field of view.
+    """
+    focal_px = frame_width / (2 * math.tan(math.radians(CAMERA_HFOV_DEGREES) / 2))
+    face_px = focal_px * FACE_WIDTH_METERS / MAX_FACE_DISTANCE_METERS
+    return max(CASCADE_WINDOW, int(face_px * scale))
+
+
+class Detector(Protocol):
+    """Anything that finds face boxes in a grayscale frame, like :class:`FaceDetector`."""
+
+    def detect(self, gray: np.ndarray) -> np.ndarray:
+        """Return an array of (x, y, w, h) boxes in ``gray`` coordinates."""
+        ...
+
+
+class FaceDetector:
+    """Run the Haar cascade on a downscaled frame and return full-resolution boxes."""
+
+    def __init__(
+        self,
+        scale: float = DETECTION_SCALE,
+        scale_factor: float = 1.2,
+        min_neighbors: int = 5,
+    ) -> None:
+        """Set the downscale ratio and cascade parameters."""
+        self.scale = min(1.0, scale)
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.cascade = get_haar_cascade()
+
+    def detect(self, gray: Any) -> Any:
+        """Detect faces in a full-resolution grayscale image.
+
+        :param gray: Grayscale image at camera resolution
+        :return: Array of (x, y, w, h) boxes in ``gray`` coordinates
+        """
+        height, width = gray.shape[:2]
+        small = gray
+        if self.scale < 1.0:
+            small = cv2.resize(
+                gray,
+                (max(1, int(width * self.scale)), max(1, int(height * self.scale))),
+                interpolation=cv2.INTER_AREA,
+            )
+
+        min_size = min_face_size(width, self.scale)
+        faces = self.cascade.detectMultiScale(
+            small,
+            scaleFactor=self.scale_factor,
+            minNeighbors=self.min_neighbors,
+            minSize=(min_size, min_size),
+        )
+        if len(faces) == 0:
+            return np.empty((0, 4), dtype=np.int32)
+
+        # Map boxes back to full resolution, clipped to the frame
+        boxes = np.rint(np.asarray(faces, dtype=np.float32) / self.scale).astype(np.int32)
+        boxes[:, 2] = np.minimum(boxes[:, 2], width - boxes[:, 0])
+        boxes[:, 3] = np.minimum(boxes[:, 3], height - boxes[:, 1])
+        return boxes
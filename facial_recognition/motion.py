@@ -0,0 +1,65 @@
+"""Cheap motion gate that decides whether a frame is worth running face detection on."""
+
+import time
+from typing import Any
+
+import cv2  # type: ignore[import]
+
+from configuration.settings import (
+    MOTION_FRAME_WIDTH,
+    MOTION_HOLD_TIME,
+    MOTION_IDLE_AFTER,
+    MOTION_PIXEL_THRESHOLD,
+    MOTION_SENSITIVITY,
+)
+
+
+class MotionDetector:
+    """Detect scene changes by differencing small blurred frames against a running background.
+
+    A frame counts as moving when more than ``sensitivity`` of its pixels differ
+    from the background. Detection stays enabled for ``hold_time`` seconds after
+    the last change so the mirror can notice someone walking away.
+    """
+
+    def __init__(
+        self,
+        sensitivity: float = MOTION_SENSITIVITY,
+        hold_time: float = MOTION_HOLD_TIME,
+        idle_after: float = MOTION_IDLE_AFTER,
+    ) -> None:
+        """Set the changed-pixel fraction that counts as motion and the hold/idle timeouts."""
+        self.sensitivity = sensitivity
+        self.hold_time = hold_time
+        self.idle_after = idle_after
+        self._background: Any = None
+        self._last_motion = time.monotonic()
+
+    def update(self, frame: Any) -> bool:
+        """Feed a BGR frame and return True if face detection should run on it."""
+        height, width = frame.shape[:2]
+        small = cv2.resize(
+            frame,
+            (MOTION_FRAME_WIDTH, max(1, height * MOTION_FRAME_WIDTH // width)),
+            interpolation=cv2.INTER_AREA,
+        )
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        if self._background is None:
+            self._background = gray.astype("float32")
+            self._last_motion = time.monotonic()
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        changed = cv2.countNonZero(cv2.threshold(diff, MOTION_PIXEL_THRESHOLD, 255, cv2.THRESH_BINARY)[1])
+        # Slowly absorb lighting changes into the background
+        cv2.accumulateWeighted(gray, self._background, 0.05)
+
+        now = time.monotonic()
+        if changed > self.sensitivity * gray.size:
+            self._last_motion = now
+        return now - self._last_motion <= self.hold_time
+
+    def idle(self) -> bool:
+        """Return True once the scene has been static long enough to poll slowly."""
+        return time.monotonic() - self._last_motion > self.idle_after
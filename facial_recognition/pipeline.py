@@ -0,0 +1,200 @@
+"""Staged capture -> detect -> recognize pipeline joined by latest-frame-wins queues."""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import cv2  # type: ignore[import]
+
+import metrics
+from configuration.settings import PIPELINE_QUEUE_SIZE, PIPELINE_STATS_INTERVAL
+from facial_recognition.camera import FrameSource
+from facial_recognition.motion import MotionDetector
+
+logger = logging.getLogger(__name__)
+
+STAGE_SECONDS = metrics.histogram(
+    "mirror_pipeline_stage_seconds", "Time per item in each pipeline stage (capture waits on the camera)", ("stage",),
+)
+PROCESSED = metrics.counter("mirror_pipeline_processed_total", "Items finished by each pipeline stage", ("stage",))
+DROPPED = metrics.counter("mirror_pipeline_dropped_total", "Stale items dropped before each stage", ("stage",))
+FPS = metrics.gauge("mirror_pipeline_fps", "Items per second through each stage since the last stats", ("stage",))
+FRAME_LATENCY = metrics.histogram(
+    "mirror_pipeline_latency_seconds", "Time from capturing a frame until the last stage has finished with it",
+)
+
+
+class LatestQueue:
+    """Bounded queue that drops the oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize: int = PIPELINE_QUEUE_SIZE, name: str = "queue") -> None:
+        """Create an empty queue holding at most ``maxsize`` items.
+
+        ``name`` is the stage reading from the queue, used to label its drop metric.
+        """
+        self._items: deque[Any] = deque()
+        self._maxsize = max(1, maxsize)
+        self._condition = threading.Condition()
+        self.drops = 0
+        self._dropped = DROPPED.labels(name)
+
+    def put(self, item: Any) -> None:
+        """Add an item, discarding the stalest one if the queue is full."""
+        with self._condition:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.drops += 1
+                self._dropped.inc()
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float | None = None) -> Any:
+        """Remove and return the oldest item, or None if nothing arrives in time."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: bool(self._items), timeout=timeout):
+                return None
+            return self._items.popleft()
+
+    def depth(self) -> int:
+        """Return the number of items waiting."""
+        with self._condition:
+            return len(self._items)
+
+
+class FramePipeline:
+    """Run capture, detection and recognition on their own threads.
+
+    ``detect`` receives a BGR frame and returns the work item for the recognize
+    stage, or None when there is nothing to recognize. ``recognize`` consumes
+    that item. Each stage only ever sees the newest output of the stage before
+    it, so a slow stage drops stale frames rather than building a backlog.
+    Items travel between stages with the time their frame was captured, so the
+    time a frame takes through every stage can be measured.
+
+    With a ``motion`` detector, static frames never reach ``detect``, and once
+    the scene has been still for a while the camera itself is switched to its
+    idle rate (see :meth:`FrameSource.set_idle`) until motion returns.
+    """
+
+    def __init__(
+        self,
+        camera: FrameSource,
+        detect: Callable[[Any], Any],
+        recognize: Callable[[Any], None],
+        stop_event: threading.Event,
+        motion: MotionDetector | None = None,
+    ) -> None:
+        """Wire the stages together; nothing runs until :meth:`run`."""
+        self.camera = camera
+        self.detect = detect
+        self.recognize = recognize
+        self.stop_event = stop_event
+        self.motion = motion
+        self.frames = LatestQueue(name="detect")
+        self.detections = LatestQueue(name="recognize")
+        self.processed = {"capture": 0, "detect": 0, "recognize": 0}
+        self.static_frames = 0
+        self.idle = False
+
+    def _capture_loop(self) -> None:
+        """Read frames from the camera as fast as it delivers them."""
+        capture_seconds, captured = STAGE_SECONDS.labels("capture"), PROCESSED.labels("capture")
+        while not self.stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                frame = self.camera.read()
+            except (cv2.error, RuntimeError) as e:
+                logger.info("Failed to capture frame: %s", e)
+                self.stop_event.wait(1.0)
+                continue
+            captured_at = time.perf_counter()
+            capture_seconds.observe(captured_at - start)
+            captured.inc()
+            self.processed["capture"] += 1
+
+            if self.motion is not None:
+                moving = self.motion.update(frame)
+                idle = self.motion.idle()
+                if idle != self.idle:
+                    logger.info("Scene %s, switching camera to %s rate", "still" if idle else "changed",
+                                "idle" if idle else "full")
+                    self.idle = idle
+                    self.camera.set_idle(idle=idle)
+                if not moving:
+                    self.static_frames += 1
+                    continue
+
+            self.frames.put((captured_at, frame))
+
+    def _stage_loop(self, name: str, source: LatestQueue, work: Callable[[Any], Any], sink: LatestQueue | None) -> None:
+        """Take items from ``source``, run ``work`` and forward any result to ``sink``."""
+        stage_seconds, processed = STAGE_SECONDS.labels(name), PROCESSED.labels(name)
+        while not self.stop_event.is_set():
+            queued = source.get(timeout=0.5)
+            if queued is None:
+                continue
+            captured_at, item = queued
+            start = time.perf_counter()
+            try:
+                result = work(item)
+            except Exception:
+                logger.exception("Error in %s stage", name)
+                continue
+            finished = time.perf_counter()
+            stage_seconds.observe(finished - start)
+            processed.inc()
+            self.processed[name] += 1
+            if sink is None:
+                FRAME_LATENCY.observe(finished - captured_at)
+            elif result is not None:
+                sink.put((captured_at, result))
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return processed counts, queue depth and drop counters for each stage."""
+        return {
+            "capture": {"processed": self.processed["capture"], "static": self.static_frames},
+            "detect": {
+                "processed": self.processed["detect"],
+                "queue_depth": self.frames.depth(),
+                "dropped": self.frames.drops,
+            },
+            "recognize": {
+                "processed": self.processed["recognize"],
+                "queue_depth": self.detections.depth(),
+                "dropped": self.detections.drops,
+            },
+        }
+
+    def run(self) -> None:
+        """Start every stage and block until ``stop_event`` is set."""
+        threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(
+                target=self._stage_loop,
+                args=("detect", self.frames, self.detect, self.detections),
+                name="detect",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._stage_loop,
+                args=("recognize", self.detections, self.recognize, None),
+                name="recognize",
+                daemon=True,
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        last, last_time = dict(self.processed), time.perf_counter()
+        while not self.stop_event.wait(PIPELINE_STATS_INTERVAL):
+            now = time.perf_counter()
+            for stage, count in self.processed.items():
+                FPS.labels(stage).set((count - last[stage]) / (now - last_time))
+            last, last_time = dict(self.processed), now
+            logger.info("Pipeline stats: %s", self.stats())
+
+        for thread in threads:
+            thread.join(timeout=2.0)
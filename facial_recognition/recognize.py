@@ -1,138 +1,287 @@
-"""Face recognition using LBPH and rpicam-still."""
+"""Face recognition on frames streamed from the camera."""
 
 import logging
 import pickle
-import subprocess
 import threading
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
 
 import cv2  # type: ignore[import]
 import FreeSimpleGUI as Sg  # type: ignore[import]
 import numpy as np  # type: ignore[import]
 
-from configuration.settings import DETECTION_THRESHOLD, RECOGNITION_THRESHOLD
+import metrics
+from configuration.settings import DETECTION_THRESHOLD
+from facial_recognition.backends import RecognizerBackend, get_backend
+from facial_recognition.camera import open_camera
+from facial_recognition.detect import FaceDetector
+from facial_recognition.motion import MotionDetector
+from facial_recognition.pipeline import FramePipeline
+from facial_recognition.store import FACE_SIZE, crop_face, load_dataset, load_faces
+from facial_recognition.tracking import FaceTracker, Track
 
 logger = logging.getLogger(__name__)
 
-TRAINER_FILE = Path("trainer.yml")
 ENCODINGS_FILE = Path("encodings.pkl")
 DATASET_DIR = Path("dataset")
 
-def capture_frame(retries: int = 3, delay: float = 1.0) -> Any:
-    """Capture a frame using rpicam-still and return as OpenCV image."""
-    tmp_file = "/tmp/capture.jpg"
+# Saved alongside the label map; models without it were trained on whole frames rather than face crops
+MODEL_FORMAT = 2
 
-    def raise_capture_error(message: str) -> None:
-        raise RuntimeError(message)
+DETECT_SECONDS = metrics.histogram("mirror_detect_seconds", "Face detection time per frame")
+PREDICT_SECONDS = metrics.histogram("mirror_predict_seconds", "Recognizer prediction time per batch of faces")
+FACES_PREDICTED = metrics.counter("mirror_faces_predicted_total", "Faces passed to the recognizer")
+RECOGNITION_EVENTS = metrics.counter("mirror_recognition_events_total", "recognized_faces events posted to the GUI")
 
-    for attempt in range(retries):
+def save_model(recognizer: RecognizerBackend, label_map: dict[int, str]) -> None:
+    """Write the recognizer and its label map to disk."""
+    recognizer.save()
+    with Path.open(ENCODINGS_FILE, "wb") as f:
+        pickle.dump({"format": MODEL_FORMAT, "labels": label_map}, f)
+
+def load_model() -> tuple[RecognizerBackend, dict[int, str]] | None:
+    """Read the configured recognizer and its label map, or None if not trained yet.
+
+    A model saved before training switched to face crops (a bare label map in
+    encodings.pkl) would never match the crops predicted on now, so it is
+    rebuilt from the dataset instead.
+    """
+    recognizer = get_backend()
+    if not recognizer.exists() or not ENCODINGS_FILE.exists():
+        return None
+    with Path.open(ENCODINGS_FILE, "rb") as f:
+        saved = pickle.load(f)
+    if not isinstance(saved, dict) or saved.get("format") != MODEL_FORMAT:
+        logger.info("Saved model was trained on whole frames, retraining on face crops")
         try:
-            # Take picture with 2-second exposure to ensure camera is ready
-            subprocess.run(
-                ["rpicam-still", "-t", "2000", "-n", "-o", tmp_file],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            # Wait briefly to ensure file is written
-            time.sleep(0.2)
-
-            # Load image
-            frame = cv2.imread(tmp_file)
-            if frame is None:
-                raise_capture_error("Failed to read captured image")
-
-        except (subprocess.CalledProcessError, cv2.error, RuntimeError) as e:
-            logger.info("Capture attempt %d failed: %s", attempt + 1, e)
-            time.sleep(delay)
-
-        return frame
-
-    raise_capture_error("Failed to capture frame after multiple attempts")
-    return None  # Unreachable
-
-def train_model() -> None:
-    """Train LBPH face recognizer from dataset images."""
-    recognizer = cv2.face.LBPHFaceRecognizer_create()  # type: ignore[attr-defined, arg-type]
-    faces = []
-    labels = []
-    label_map = {}
-    current_label = 0
-
-    for person in sorted(Path.iterdir(DATASET_DIR)):
-        person_dir = DATASET_DIR / person
-        if not person_dir.is_dir():
-            continue
-        for img_file in person_dir.glob("*.jpg"):
-            img = cv2.imread(str(img_file), cv2.IMREAD_GRAYSCALE)
-            if img is None:
-                continue
-            # Resize to fixed size
-            img = cv2.resize(img, (200, 200))
-            faces.append(img.astype(np.uint8))
-            labels.append(current_label)
-        label_map[current_label] = person
-        current_label += 1
-
-    if not faces:
+            return train_model()
+        except (OSError, RuntimeError):
+            logger.exception("Could not retrain the old model")
+            return None
+    recognizer.load()
+    return recognizer, saved["labels"]
+
+def train_model() -> tuple[RecognizerBackend, dict[int, str]]:
+    """Rebuild the face recognizer from every person in the dataset, save and return it.
+
+    Faces come from each person's cached crop store, so images are only decoded
+    (on a thread pool) when they changed since the store was written.
+    """
+    recognizer = get_backend()
+    person_dirs = [person_dir for person_dir in sorted(DATASET_DIR.iterdir()) if person_dir.is_dir()]
+    label_map = {label: person_dir.name for label, person_dir in enumerate(person_dirs)}
+    faces, labels = load_dataset(person_dirs)
+
+    if len(faces) == 0:
         msg = "No faces found in dataset to train"
         raise RuntimeError(msg)
 
     # Train recognizer
-    recognizer.train(faces, np.array(labels))
-    recognizer.save(str(TRAINER_FILE))
-
-    with Path.open(ENCODINGS_FILE, "wb") as f:
-        pickle.dump(label_map, f)
+    recognizer.train(faces, labels)
+    save_model(recognizer, label_map)
     logger.info("Model trained successfully")
+    return recognizer, label_map
 
-def recognize_faces(window: Sg.Window, stop_event: threading.Event) -> None:
-    """Continuously recognize faces using rpicam-still and call callback(name)."""
-    logger.info("Starting face recognition...")
-    no_faces = 0
+def update_model(
+    name: str,
+    model: tuple[RecognizerBackend, dict[int, str]] | None = None,
+) -> tuple[RecognizerBackend, dict[int, str]]:
+    """Add one person's samples to a model without retraining everyone else, save and return it.
 
-    if not TRAINER_FILE.exists() or not ENCODINGS_FILE.exists():
-        logger.info("Trainer file or encodings not found. Train first.")
-        return
+    ``model`` is updated in place, so pass one nothing else is predicting with;
+    without it the saved model is loaded first. Falls back to a full
+    :func:`train_model` when there is no model yet, or when ``name`` is already
+    enrolled, since their old samples cannot be taken out of the model.
+    """
+    model = model if model is not None else load_model()
+    if model is None:
+        logger.info("No existing model, training from scratch")
+        return train_model()
+    recognizer, label_map = model
+    if name in label_map.values():
+        logger.info("%s is already enrolled, retraining to replace their samples", name)
+        return train_model()
 
-    recognizer = cv2.face.LBPHFaceRecognizer_create()  # type: ignore[attr-defined]
-    recognizer.read(str(TRAINER_FILE))
-    with Path.open(ENCODINGS_FILE, "rb") as f:
-        label_map = pickle.load(f)
+    faces = load_faces(DATASET_DIR / name)
+    if len(faces) == 0:
+        msg = f"No faces found in dataset for {name}"
+        raise RuntimeError(msg)
 
-    face_cascade = cv2.CascadeClassifier("/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml")
+    label = max(label_map, default=-1) + 1
+    label_map = {**label_map, label: name}
+    recognizer.update(faces, np.full(len(faces), label, dtype=np.int32))
+    save_model(recognizer, label_map)
+    logger.info("Model updated with %d samples for %s", len(faces), name)
+    return recognizer, label_map
 
-    while not stop_event.is_set():
-        try:
-            frame = capture_frame()
-        except (cv2.error, RuntimeError) as e:
-            logger.info("Failed to capture frame: %s", e)
-            continue
+class RecognitionStages:
+    """Detect and recognize callbacks for the frame pipeline, sharing tracker state.
+
+    The two callbacks run on different pipeline threads, so the tracks and the
+    no-face count are only touched while holding ``lock``.
+    """
 
+    def __init__(self, window: Sg.Window, recognizer: RecognizerBackend, label_map: dict[int, str]) -> None:
+        """Set the window to post events to and the trained recognizer."""
+        self.window = window
+        self.model = (recognizer, label_map)
+        self.face_detector = FaceDetector()
+        self.tracker = FaceTracker()
+        self.no_faces = 0
+        self.lock = threading.Lock()
+
+    def detect(self, frame: np.ndarray) -> tuple[np.ndarray, list[tuple[Track, tuple]]] | None:
+        """Find faces, update tracks and return the tracks that need a prediction."""
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=5)
-        logger.info("Detected %d faces", len(faces))
-
-        # If no faces detected for several frames, notify no recognition
-        if len(faces) == 0:
-            if no_faces == DETECTION_THRESHOLD:
-                window.write_event_value("no_recognition", "")
-                no_faces = 0
-
-            no_faces += 1
-            continue
-
-        for (x, y, w, h) in faces:
-            roi = gray[y:y+h, x:x+w]
-            try:
-                label, conf = recognizer.predict(roi)
+        start = time.perf_counter()
+        faces = self.face_detector.detect(gray)
+        DETECT_SECONDS.observe(time.perf_counter() - start)
+        logger.debug("Detected %d faces", len(faces))
+
+        with self.lock:
+            tracks = self.tracker.update(faces)
+
+            # If no faces detected for several frames, notify no recognition
+            if len(faces) == 0:
+                if self.no_faces == DETECTION_THRESHOLD:
+                    self.window.write_event_value("no_recognition", "")
+                    self.no_faces = 0
+                    # Greet whoever is still tracked again once they are next verified
+                    for track in tracks:
+                        track.announced_name = None
+
+                self.no_faces += 1
+                return None
+
+            # A recognized person in view is only predicted again every few dozen frames
+            if any(track.misses == 0 and track.name is not None for track in tracks):
+                self.no_faces = 0
+
+            # Only predict for tracks that are new, unrecognized or due for re-verification
+            pending = [(track, track.box) for track in tracks if track.misses == 0 and track.needs_verification()]
+            for track, _ in pending:
+                track.mark_requested()
+        return (gray, pending) if pending else None
+
+    def recognize(self, item: tuple[np.ndarray, list[tuple[Track, tuple]]]) -> None:
+        """Predict identities for all pending tracks in one batch and announce new ones together."""
+        gray, pending = item
+        recognizer, label_map = self.model  # one consistent model for the whole batch
+        crops = np.empty((len(pending), *FACE_SIZE[::-1]), dtype=np.uint8)
+        for index, (_, box) in enumerate(pending):
+            crops[index] = crop_face(gray, box)
+
+        start = time.perf_counter()
+        try:
+            results = recognizer.predict_batch(crops)
+        except cv2.error as e:
+            logger.info("Recognition error: %s", e)
+            return
+        PREDICT_SECONDS.observe(time.perf_counter() - start)
+        FACES_PREDICTED.inc(len(crops))
+
+        announced = []
+        with self.lock:
+            for (track, _), (label, conf) in zip(pending, results, strict=True):
                 name = label_map.get(label, "Unknown")
-                logger.info("Found %s with confidence %d", name, conf)
-                if conf < RECOGNITION_THRESHOLD:  # threshold for recognition
-                    window.write_event_value("recognized_face", name)
-                    no_faces = 0
-            except cv2.error as e:
-                logger.info("Recognition error: %s", e)
-                continue
+                logger.info("Found %s with confidence %.2f (track %d)", name, conf, track.id)
+                if track.set_identity(name, conf, recognizer.threshold):
+                    announced.append(name)
+                if track.name is not None:
+                    self.no_faces = 0
+
+        if announced:
+            self.window.write_event_value("recognized_faces", announced)
+            RECOGNITION_EVENTS.inc()
+
+class RecognitionService:
+    """Own the recognition pipeline thread and the camera it reads from.
+
+    Capture, detection and recognition run as separate pipeline stages so a slow
+    predict never delays the next capture. Faces are tracked between frames and
+    each newly recognized person is posted once, grouped per frame in a single
+    ``recognized_faces`` event carrying a list of names.
+
+    :meth:`paused` releases the camera for other users such as enrollment. The
+    model stays in memory across pauses, so a new person is added to it with
+    :meth:`add_person` while paused, without reading it back, and the pipeline
+    picks it up when it resumes.
+    """
+
+    def __init__(self, window: Sg.Window) -> None:
+        """Set the window to post events to; nothing runs until :meth:`start`."""
+        self.window = window
+        self.model: tuple[RecognizerBackend, dict[int, str]] | None = None
+        self.stages: RecognitionStages | None = None
+        self.stop_event = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.pause_count = 0
+        self.lock = threading.RLock()
+
+    def is_running(self) -> bool:
+        """Return True while the pipeline thread is alive."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self) -> None:
+        """Load the model and start recognizing, unless running, paused or untrained."""
+        with self.lock:
+            if self.is_running() or self.pause_count:
+                return
+            logger.info("Starting face recognition...")
+            if self.model is None:
+                self.model = load_model()
+            if self.model is None:
+                logger.info("Trained model or encodings not found. Train first.")
+                return
+            self.stages = RecognitionStages(self.window, *self.model)
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(self.stages, self.stop_event),
+                                           name="recognition", daemon=True)
+            self.thread.start()
+
+    def _run(self, stages: RecognitionStages, stop_event: threading.Event) -> None:
+        """Stream frames through the pipeline until ``stop_event`` is set."""
+        try:
+            with open_camera() as camera:
+                FramePipeline(camera, stages.detect, stages.recognize, stop_event, motion=MotionDetector()).run()
+        except Exception:
+            logger.exception("Face recognition stopped")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the pipeline and wait for it to release the camera."""
+        with self.lock:
+            self.stop_event.set()
+            if self.thread is not None:
+                self.thread.join(timeout=timeout)
+                if self.thread.is_alive():
+                    logger.warning("Recognition thread did not stop within %.0fs", timeout)
+            self.thread = None
+
+    def add_person(self, name: str) -> None:
+        """Add ``name``'s saved samples to the model held in memory and save it once.
+
+        Call while recognition is paused or stopped, so nothing predicts with the
+        model while it changes; it is used from the next :meth:`start`.
+        """
+        with self.lock:
+            if self.is_running():
+                msg = "Pause recognition before adding a person to the model"
+                raise RuntimeError(msg)
+            self.model = update_model(name, self.model)
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Release the camera for the duration of the block, then resume if it was running."""
+        with self.lock:
+            was_running = self.is_running()
+            self.pause_count += 1
+            self.stop()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.pause_count -= 1
+                if was_running:
+                    self.start()
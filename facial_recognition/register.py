@@ -1,13 +1,21 @@
-"""Register new persons and capture face dataset using rpicam-still."""
+"""Register new persons and capture face dataset from the camera stream."""
 
 import logging
-import subprocess
+import shutil
+import threading
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import cv2  # type: ignore[import]
 import FreeSimpleGUI as Sg  # type: ignore[import]
+import numpy as np  # type: ignore[import]
 
-from configuration.settings import NUM_SAMPLES
+from configuration.settings import NUM_SAMPLES, REGISTER_MIN_DIFFERENCE, REGISTER_TIMEOUT
+from facial_recognition.camera import FrameSource, open_camera
+from facial_recognition.detect import Detector, FaceDetector
+from facial_recognition.pipeline import FramePipeline
+from facial_recognition.store import crop_face, largest_face, save_faces
 
 logger = logging.getLogger(__name__)
 
@@ -16,53 +24,153 @@ DATASET_DIR = Path("dataset")
 TRAINER_FILE = Path("trainer.yml")
 ENCODINGS_FILE = Path("encodings.pkl")
 
-def get_haar_cascade() -> cv2.CascadeClassifier:
-    """Return the frontal face Haar cascade."""
-    # Try default OpenCV path
-    possible = [
-        "/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml",
-        "/usr/share/opencv/haarcascades/haarcascade_frontalface_default.xml",
-    ]
-    for path in possible:
-        if Path(path).exists():
-            return cv2.CascadeClassifier(str(path))
-    msg = "Could not find haarcascade_frontalface_default.xml on system"
-    raise FileNotFoundError(msg)
-
-def register_person(window: Sg.Window, name: str) -> None:
-    """Capture face images for a new person and save in dataset."""
-    window["progress_bar"].update(visible=True)
+# Side of the thumbnails compared to reject near-duplicate poses
+THUMB_SIZE = 32
 
+
+class EnrollmentStoppedError(RuntimeError):
+    """Raised when enrollment is cancelled or times out before enough samples are kept."""
+
+
+class Enrollment:
+    """Verify and save samples for one person as frames stream in.
+
+    ``verify`` runs on the pipeline's detect thread and rejects frames with no
+    face or a pose too close to one already kept. ``save`` runs on the next
+    stage and writes accepted samples while the following frame is verified.
+    A pose only counts as kept once ``save`` has written it: the queue between
+    the stages drops stale items, so a sample ``verify`` accepted may never
+    reach ``save``. Whenever the sample count or status message changes it is
+    passed to ``report`` as ``(count, status)``.
+    """
+
+    def __init__(
+        self,
+        person_dir: Path,
+        name: str,
+        stop_event: threading.Event,
+        report: Callable[[int, str], None] | None = None,
+        face_detector: Detector | None = None,
+    ) -> None:
+        """Prepare to collect ``NUM_SAMPLES`` samples into ``person_dir``."""
+        self.person_dir = person_dir
+        self.name = name
+        self.stop_event = stop_event
+        self.report = report
+        self.face_detector = face_detector or FaceDetector(scale_factor=1.3)
+        self.thumbs = np.empty((0, THUMB_SIZE * THUMB_SIZE), dtype=np.float32)
+        self.crops: list[np.ndarray] = []
+        self.status = ""
+        self.reported: tuple[int, str] | None = None
+        self.lock = threading.Lock()
+
+    def set_status(self, status: str) -> None:
+        """Store the status message and report progress if anything changed."""
+        with self.lock:
+            self.status = status
+            progress = (len(self.crops), status)
+            if progress == self.reported:
+                return
+            self.reported = progress
+        if self.report is not None:
+            self.report(*progress)
+
+    def is_duplicate(self, thumb: np.ndarray) -> bool:
+        """Return True if ``thumb`` is too close to the pose of a kept sample."""
+        thumbs = self.thumbs
+        return bool(len(thumbs)) and np.abs(thumbs - thumb).mean(axis=1).min() < REGISTER_MIN_DIFFERENCE
+
+    def verify(self, frame: Any) -> tuple[Any, np.ndarray, np.ndarray] | None:
+        """Return (frame, face crop, pose thumbnail) if the frame holds a new, distinct face."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = self.face_detector.detect(gray)
+        if len(faces) == 0:
+            self.set_status("No face detected, retrying...")
+            return None
+
+        crop = crop_face(gray, largest_face(faces))
+        thumb = cv2.resize(crop, (THUMB_SIZE, THUMB_SIZE), interpolation=cv2.INTER_AREA)
+        thumb = thumb.astype(np.float32).reshape(1, -1)
+        if self.is_duplicate(thumb):
+            self.set_status("Move your head slowly to a new angle")
+            return None
+
+        self.set_status("")
+        return frame, crop, thumb
+
+    def save(self, item: tuple[Any, np.ndarray, np.ndarray]) -> None:
+        """Write an accepted sample to the dataset, keep its pose and stop once enough are kept."""
+        frame, crop, thumb = item
+        # verify may have passed several frames of one pose before the first was kept
+        if len(self.crops) >= NUM_SAMPLES or self.is_duplicate(thumb):
+            return
+        filename = self.person_dir / f"{self.name}_{len(self.crops)}.jpg"
+        cv2.imwrite(str(filename), frame)
+        with self.lock:
+            self.crops.append(crop)
+            self.thumbs = np.vstack((self.thumbs, thumb))
+        self.set_status(self.status)
+        logger.info("Captured %s", filename)
+        if len(self.crops) >= NUM_SAMPLES:
+            self.stop_event.set()
+
+
+def register_person(  # noqa: PLR0913 - the camera and detector are injectable for benchmarks
+    window: Sg.Window,
+    name: str,
+    stop_event: threading.Event | None = None,
+    *,
+    timeout: float = REGISTER_TIMEOUT,
+    camera: FrameSource | None = None,
+    face_detector: Detector | None = None,
+) -> None:
+    """Capture face images for a new person and save in dataset.
+
+    Blocks until enough samples are kept, so run it off the GUI thread.
+    Progress is posted as ``register_progress`` events carrying
+    ``(count, status)`` through ``window.write_event_value``.
+
+    :param stop_event: Set from another thread to cancel capturing
+    :param timeout: Seconds allowed to collect every sample
+    :param camera: Frame source to read from instead of the configured camera
+    :param face_detector: Detector to find faces with instead of the Haar cascade
+    :raises EnrollmentStoppedError: If cancelled or out of time; a new person's
+        partial samples are removed
+    """
     person_dir = DATASET_DIR / name
+    is_new = not person_dir.exists()
     person_dir.mkdir(parents=True, exist_ok=True)
 
-    face_cascade = get_haar_cascade()
     logger.info("Capturing %d images for %s...", NUM_SAMPLES, name)
-    i = 0
-
-    while i < NUM_SAMPLES:
-        window.read(timeout=100)
-        filename = person_dir / f"{name}_{i}.jpg"
-        cmd = f"rpicam-still -o {filename} -t 500 -n"
-        subprocess.run(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True,
-            shell=True,
-        )
-        logger.info("Captured %s", filename)
+    stop_event = stop_event or threading.Event()
+    enrollment = Enrollment(
+        person_dir, name, stop_event,
+        report=lambda count, status: window.write_event_value("register_progress", (count, status)),
+        face_detector=face_detector,
+    )
 
-        # Verify face detection
-        img = cv2.imread(str(filename), cv2.IMREAD_GRAYSCALE)
-        faces = face_cascade.detectMultiScale(img, 1.3, 5)    # type: ignore[attr-defined, arg-type]
-        if len(faces) == 0:
-            logger.info("No face detected in %s, retrying...", filename)
-            window["quote_of_day"].update("No face detected, retrying...")
-        else:
-            logger.info("Face detected in %s", filename)
-            window["progress_bar"].update(i + 1)
-            window["quote_of_day"].update("")
-            i += 1
+    # The deadline stops the pipeline the same way a cancel or a full set of samples does
+    timed_out = threading.Event()
+
+    def expire() -> None:
+        timed_out.set()
+        stop_event.set()
+
+    deadline = threading.Timer(timeout, expire)
+    deadline.daemon = True
+    deadline.start()
+    try:
+        with camera if camera is not None else open_camera() as source:
+            FramePipeline(source, enrollment.verify, enrollment.save, stop_event).run()
+    finally:
+        deadline.cancel()
+
+    if len(enrollment.crops) < NUM_SAMPLES:
+        if is_new:
+            shutil.rmtree(person_dir, ignore_errors=True)
+        reason = f"timed out after {timeout:.0f}s" if timed_out.is_set() else "was cancelled"
+        msg = f"Enrollment of {name} {reason} with {len(enrollment.crops)} of {NUM_SAMPLES} samples"
+        raise EnrollmentStoppedError(msg)
 
+    save_faces(person_dir, enrollment.crops)
     logger.info("Finished capturing for %s", name)
@@ -0,0 +1,141 @@
+"""Per-person cache of preprocessed face crops used for training."""
+
+import hashlib
+import logging
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import cv2  # type: ignore[import]
+import numpy as np  # type: ignore[import]
+
+from configuration.settings import TRAIN_WORKERS
+from facial_recognition.detect import FaceDetector
+from fileio import atomic_open
+
+logger = logging.getLogger(__name__)
+
+FACE_SIZE = (200, 200)
+STORE_NAME = "faces.npz"
+
+# Cascade classifiers are not shared between threads
+_local = threading.local()
+
+
+def crop_face(gray: Any, box: Any) -> np.ndarray:
+    """Cut ``box`` out of a grayscale frame and resize it to ``FACE_SIZE``."""
+    x, y, w, h = (int(v) for v in box)
+    return cv2.resize(gray[y:y+h, x:x+w], FACE_SIZE, interpolation=cv2.INTER_AREA).astype(np.uint8)
+
+
+def largest_face(boxes: Any) -> Any:
+    """Return the biggest (x, y, w, h) box."""
+    return max(boxes, key=lambda box: box[2] * box[3])
+
+
+def source_signature(person_dir: Path) -> str:
+    """Fingerprint the sample images in ``person_dir`` from their names, sizes and mtimes."""
+    digest = hashlib.sha1(usedforsecurity=False)
+    for img_file in sorted(person_dir.glob("*.jpg")):
+        stat = img_file.stat()
+        digest.update(f"{img_file.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def save_faces(person_dir: Path, faces: list[np.ndarray] | np.ndarray) -> None:
+    """Store face crops for ``person_dir``, stamped with the current image signature."""
+    array = np.asarray(faces, dtype=np.uint8).reshape(-1, *FACE_SIZE[::-1])
+    with atomic_open(person_dir / STORE_NAME) as f:
+        np.savez(f, faces=array, signature=np.array(source_signature(person_dir)))
+
+
+def _detector() -> FaceDetector:
+    """Return this thread's face detector, creating it on first use."""
+    if not hasattr(_local, "detector"):
+        _local.detector = FaceDetector()
+    return _local.detector
+
+
+def prepare_image(img_file: Path) -> np.ndarray | None:
+    """Decode one sample image and return its largest face crop, or None if there is no face."""
+    img = cv2.imread(str(img_file), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return None
+    boxes = _detector().detect(img)
+    if len(boxes) == 0:
+        logger.info("No face detected in %s, skipping", img_file)
+        return None
+    return crop_face(img, largest_face(boxes))
+
+
+def load_cached(person_dir: Path) -> np.ndarray | None:
+    """Return the stored face crops for ``person_dir`` if they match the images on disk.
+
+    A store that cannot be read, e.g. one cut short by a crash, counts as stale.
+    """
+    store = person_dir / STORE_NAME
+    if not store.exists():
+        return None
+    try:
+        with np.load(store) as data:
+            if str(data["signature"]) == source_signature(person_dir):
+                return data["faces"]
+    except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+        logger.warning("Face cache for %s is unreadable, rebuilding", person_dir.name, exc_info=True)
+        return None
+    logger.info("Face cache for %s is stale, rebuilding", person_dir.name)
+    return None
+
+
+def load_dataset(person_dirs: list[Path], workers: int = TRAIN_WORKERS) -> tuple[np.ndarray, np.ndarray]:
+    """Load face crops for several people into one array, rebuilding stale caches in parallel.
+
+    :param person_dirs: One dataset directory per person, in label order
+    :param workers: Threads used to decode and crop images for stale caches
+    :return: (faces, labels) where faces is N x 200 x 200 and labels[i] indexes person_dirs
+    """
+    start = time.perf_counter()
+    decoded = 0
+    per_person: list[Any] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = {}
+        for person_dir in person_dirs:
+            cached = load_cached(person_dir)
+            if cached is None:
+                images = sorted(person_dir.glob("*.jpg"))
+                pending[person_dir] = (len(images), executor.map(prepare_image, images))
+                decoded += len(images)
+            per_person.append(cached)
+
+        for index, person_dir in enumerate(person_dirs):
+            if person_dir in pending:
+                # Fill a preallocated array as crops arrive, then drop the slots of images without a face
+                count, results = pending[person_dir]
+                crops = np.empty((count, *FACE_SIZE[::-1]), dtype=np.uint8)
+                kept = 0
+                for crop in results:
+                    if crop is not None:
+                        crops[kept] = crop
+                        kept += 1
+                per_person[index] = crops[:kept]
+                save_faces(person_dir, per_person[index])
+
+    empty = np.empty((0, *FACE_SIZE[::-1]), dtype=np.uint8)
+    faces = np.concatenate(per_person) if per_person else empty
+    labels = np.repeat(np.arange(len(per_person), dtype=np.int32), [len(crops) for crops in per_person])
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    logger.info(
+        "Loaded %d faces in %.2fs, decoding %d images at %.0f images/s with %d workers",
+        len(faces), elapsed, decoded, decoded / elapsed, workers,
+    )
+    return faces, labels
+
+
+def load_faces(person_dir: Path) -> np.ndarray:
+    """Return the face crops for one person, rebuilding them if the images changed."""
+    return load_dataset([person_dir])[0]
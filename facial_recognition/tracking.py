@@ -0,0 +1,111 @@
+"""Associate face boxes across frames so each person is recognized once per track."""
+
+import itertools
+from typing import Any
+
+from configuration.settings import (
+    RECOGNITION_THRESHOLD,
+    TRACK_IOU_THRESHOLD,
+    TRACK_MAX_MISSES,
+    TRACK_RETRY_FRAMES,
+    TRACK_REVERIFY_FRAMES,
+)
+
+_track_ids = itertools.count(1)
+
+
+def iou(a: Any, b: Any) -> float:
+    """Return intersection over union of two (x, y, w, h) boxes."""
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union else 0.0
+
+
+class Track:
+    """A face followed across frames, with its cached identity."""
+
+    def __init__(self, box: Any) -> None:
+        """Start a track at ``box`` with no identity yet."""
+        self.id = next(_track_ids)
+        self.box = tuple(int(v) for v in box)
+        self.name: str | None = None
+        self.confidence = float("inf")
+        self.announced_name: str | None = None
+        self.misses = 0
+        self.since_verify = 0
+        self.requested = False
+
+    def needs_verification(self) -> bool:
+        """Return True if the identity should be (re)checked on this frame.
+
+        New and unrecognized tracks are retried every few frames; recognized
+        tracks are only re-verified every ``TRACK_REVERIFY_FRAMES`` frames.
+        """
+        if not self.requested:
+            return True
+        if self.name is None:
+            return self.since_verify >= TRACK_RETRY_FRAMES
+        return self.since_verify >= TRACK_REVERIFY_FRAMES
+
+    def mark_requested(self) -> None:
+        """Note that a prediction for this track has been queued."""
+        self.requested = True
+        self.since_verify = 0
+
+    def set_identity(self, name: str, confidence: float, threshold: float = RECOGNITION_THRESHOLD) -> bool:
+        """Store a prediction and return True if it is a new confident identity to announce.
+
+        A prediction at or above ``threshold`` clears the cached identity so the
+        track is retried until it is recognized again.
+        """
+        self.confidence = confidence
+        if confidence >= threshold:
+            self.name = None
+            return False
+        self.name = name
+        if self.announced_name == name:
+            return False
+        self.announced_name = name
+        return True
+
+
+class FaceTracker:
+    """Greedy IoU matching of detections to existing tracks."""
+
+    def __init__(self) -> None:
+        """Start with no tracks."""
+        self.tracks: list[Track] = []
+
+    def update(self, boxes: Any) -> list[Track]:
+        """Match ``boxes`` from the latest frame to tracks and return the live tracks."""
+        pairs = sorted(
+            (
+                (iou(track.box, box), t, b)
+                for t, track in enumerate(self.tracks)
+                for b, box in enumerate(boxes)
+            ),
+            reverse=True,
+        )
+        matched_tracks: set[int] = set()
+        matched_boxes: set[int] = set()
+        for overlap, t, b in pairs:
+            if overlap < TRACK_IOU_THRESHOLD:
+                break
+            if t in matched_tracks or b in matched_boxes:
+                continue
+            matched_tracks.add(t)
+            matched_boxes.add(b)
+            track = self.tracks[t]
+            track.box = tuple(int(v) for v in boxes[b])
+            track.misses = 0
+
+        for t, track in enumerate(self.tracks):
+            track.since_verify += 1
+            if t not in matched_tracks:
+                track.misses += 1
+
+        self.tracks = [track for track in self.tracks if track.misses <= TRACK_MAX_MISSES]
+        self.tracks.extend(Track(box) for b, box in enumerate(boxes) if b not in matched_boxes)
+        return self.tracks
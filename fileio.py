@@ -0,0 +1,37 @@
+"""Small file helpers shared by the modules that persist state."""
+
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+
+@contextmanager
+def atomic_open(path: Path) -> Iterator[BinaryIO]:
+    """Open a binary file that replaces ``path`` only once the block finishes without error.
+
+    Writes go to a uniquely named temporary file in the same directory, which
+    is flushed to disk and then renamed over ``path``. Readers see either the
+    old file or the new one, concurrent writers never share a temporary file,
+    and a crash never leaves a half-written ``path``.
+    """
+    directory = path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to ``path`` as UTF-8 through :func:`atomic_open`."""
+    with atomic_open(path) as f:
+        f.write(text.encode("utf-8"))
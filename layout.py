@@ -1,9 +1,18 @@
 """Layout module for Smart Mirror application."""
+from datetime import datetime
+from typing import Any
+
 import FreeSimpleGUI as Sg  # type: ignore[import]
+import pytz  # type: ignore[import]
 
+import metrics
 from configuration import settings
 from configuration.settings import NUM_SAMPLES
-from weather import get_weather_data
+from weather_snapshot import is_stale
+
+GUI_UPDATES = metrics.counter(
+    "mirror_gui_updates_total", "Element updates sent to the window, or skipped as unchanged", ("result",),
+)
 
 
 def create_weather_layout() -> list:
@@ -31,6 +40,10 @@ def create_weather_layout() -> list:
         [Sg.Text("", pad=((0, 0), (0, 0)), key="current_precipitation"),
          Sg.Text("", pad=((0, 0), (0, 0)), key="precipitation_chance")],
 
+        # One summary line per extra location
+        *[[Sg.Text("", pad=((0, 0), (10, 0)), key=f"location_{i}")]
+          for i in range(1, len(settings.WEATHER_LOCATIONS))],
+
         [Sg.VPush()],
         [Sg.Push()],
     ]
@@ -71,15 +84,92 @@ def create_weather_layout() -> list:
 
 
 
+class WindowView:
+    """Wrap a window so element updates that would not change anything are skipped.
+
+    ``view[key].update(...)`` remembers the arguments last pushed to each
+    element and only calls through to Tk when one of them differs, saving a
+    relayout and redraw per unchanged widget. Everything else is passed to
+    the wrapped window, so the view can be used anywhere a window is expected.
+    """
+
+    def __init__(self, window: Sg.Window) -> None:
+        """Start with nothing rendered.
+
+        :param window: The finalized window to draw to
+        """
+        self.window = window
+        self.rendered: dict[str, dict[str, Any]] = {}
+        self.applied = 0
+        self.skipped = 0
+        self._applied_metric, self._skipped_metric = GUI_UPDATES.labels("applied"), GUI_UPDATES.labels("skipped")
+
+    def __getitem__(self, key: str) -> "ElementView":
+        """Return the element ``key`` wrapped so its updates go through the view."""
+        return ElementView(self, key)
+
+    def __getattr__(self, name: str) -> Any:
+        """Pass anything else (read, refresh, write_event_value, ...) to the window."""
+        return getattr(self.window, name)
+
+    def update(self, key: str, *args: Any, **kwargs: Any) -> bool:
+        """Push an update to element ``key`` unless it matches what is already shown.
+
+        :return: True if the element was updated
+        """
+        wanted = {f"arg{i}": value for i, value in enumerate(args)} | kwargs
+        rendered = self.rendered.setdefault(key, {})
+        if all(name in rendered and rendered[name] == value for name, value in wanted.items()):
+            self.skipped += 1
+            self._skipped_metric.inc()
+            return False
+        self.window[key].update(*args, **kwargs)
+        rendered.update(wanted)
+        self.applied += 1
+        self._applied_metric.inc()
+        return True
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Forget what was rendered for ``key`` (or every element) so the next update is applied."""
+        if key is None:
+            self.rendered.clear()
+        else:
+            self.rendered.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Return how many element updates were applied and how many were skipped."""
+        return {"applied": self.applied, "skipped": self.skipped}
+
+
+class ElementView:
+    """One element of a ``WindowView``."""
+
+    def __init__(self, view: WindowView, key: str) -> None:
+        """Bind to element ``key`` of ``view``."""
+        self.view = view
+        self.key = key
+
+    def update(self, *args: Any, **kwargs: Any) -> bool:
+        """Update the element if the arguments differ from what it shows."""
+        return self.view.update(self.key, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        """Pass anything else to the underlying element."""
+        return getattr(self.view.window[self.key], name)
+
 ################################################
 # ---------- Update weather and GUI ---------- #
 ################################################
-def update_weather(window: Sg.Window) -> None:
-    """Fetch and update the weather data in the GUI window.
+def update_weather(window: Sg.Window, weather: list[tuple]) -> None:
+    """Update the weather data in the GUI window.
+
+    The first location fills the main panel and every other location gets a
+    one-line summary.
 
     :param window: The GUI window to update
+    :param weather: One (daily_dict, hourly_dict, current_weather) per location from get_weather_data
     """
-    daily_dict, hourly_dict, current_weather = get_weather_data()
+    daily_dict, hourly_dict, current_weather = weather[0]
 
     # Choose which to display rain or snow
     if hourly_dict:
@@ -94,7 +184,13 @@ def update_weather(window: Sg.Window) -> None:
         window["current_precipitation"].update("No hourly data")
         window["precipitation_chance"].update("")
 
-    window["date"].update(f"{daily_dict[0].get('date','')}" if daily_dict else "")
+    date = f"{daily_dict[0].get('date','')}" if daily_dict else ""
+    if is_stale(current_weather):
+        # Snapshots saved before the timezone was recorded fall back to the mirror's own
+        timezone = pytz.timezone(current_weather.get("timezone", settings.TIMEZONE))
+        fetched_at = datetime.fromtimestamp(current_weather.get("fetched_at", 0), timezone)
+        date += f"  (last updated {fetched_at.strftime('%b %d %I:%M %p')})"
+    window["date"].update(date)
     window["current_temp"].update(f"Current Temperature: {current_weather.get('temperature_2m','')}\t")
     window["current_apparent_temp"].update("Current Apparent Temperature:"
                                            f"{current_weather.get('apparent_temperature','')}\t")
@@ -113,3 +209,19 @@ def update_weather(window: Sg.Window) -> None:
                           f"{current_weather.get('wind_direction_10m','')}")
 
     window["humidity"].update(f"Humidity: {current_weather.get('relative_humidity_2m','')}\t")
+
+    for i in range(1, len(settings.WEATHER_LOCATIONS)):
+        window[f"location_{i}"].update(format_location(weather[i]) if i < len(weather) else "")
+
+
+def format_location(location_weather: tuple) -> str:
+    """Summarize one extra location's current weather on a single line.
+
+    :param location_weather: (daily_dict, hourly_dict, current_weather) for the location
+    :return: Text for the location's summary line
+    """
+    _, _, current_weather = location_weather
+    return (f"{current_weather.get('location', '')} {current_weather.get('time', '')}: "
+            f"{current_weather.get('temperature_2m', '')} "
+            f"(feels {current_weather.get('apparent_temperature', '')}), "
+            f"Wind {current_weather.get('wind_speed_10m', '')} {current_weather.get('wind_direction_10m', '')}")
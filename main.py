@@ -1,25 +1,32 @@
 """Smart Mirror Application with Face Recognition using rpicam-still."""
 
-import contextlib
 import logging
+import math
 import os
 import random
 import re
 import threading
 import time
-from collections import deque
-from datetime import datetime
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import FreeSimpleGUI as Sg  # type: ignore[import]
 import pytz  # type: ignore[import]
 
+import metrics
 from configuration import settings
-from configuration.quotes import dad_jokes, dark_humor, my_quotes, quotes, racist_jokes, sexist_jokes
-from configuration.records import records
-from facial_recognition.recognize import recognize_faces, train_model
-from facial_recognition.register import register_person
-from layout import create_weather_layout, update_weather
+from configuration.settings import CONTENT_MENU, PROMPT_TIMEOUT
+from content import ContentStore
+from layout import WindowView, create_weather_layout, update_weather
+from preferences import preferences
+from sampler import RecencySampler
+from weather_snapshot import load_snapshot
+
+if TYPE_CHECKING:
+    from facial_recognition.recognize import RecognitionService
+    from weather import WeatherWorker
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -27,8 +34,16 @@ logging.basicConfig(
     format="%(message)s",
 )
 
-# History for quote picking
-history: deque[int] = deque(maxlen=20)
+EVENT_SECONDS = metrics.histogram("mirror_gui_event_seconds", "Time the GUI thread spends handling each window event")
+
+# Seconds "Successfully Registered!" stays up before asking for preferences
+REGISTERED_MESSAGE_TIME = 2
+
+# Quotes and jokes by category, read from the content directory on demand
+content = ContentStore()
+
+# One sampler per category, so picks in one category never penalize another
+samplers: dict[str, RecencySampler] = {}
 
 # Types of greeting messages
 GREETING_MESSAGES = [
@@ -48,257 +63,466 @@ GREETING_MESSAGES = [
     "Salve",
 ]
 
+# Category shown as the quote of the day rather than offered as a choice
+QUOTE_OF_DAY_CATEGORY = "quotes"
 
-def pick_index(array_to_pick_from: list[str] = quotes) -> int:
-    """Pick an index from array avoiding recent picks."""
-    if array_to_pick_from is None:
-        array_to_pick_from = quotes
-    length = max(1, len(array_to_pick_from))
-    weights = [1.0] * length
-    for h in history:
-        if 0 <= h < length:
-            weights[h] *= 0.3
-    index = random.choices(range(length), weights=weights, k=1)[0]
-    history.append(index)
-    return index
-
-def choose_what_to_display(window: Sg.Window, name: str) -> None:
-    """Ask user what type of content to display via GUI."""
-    first_question_asked = False
-
-    if name not in records:
-        records[name] = []
-
-    while True:
-        event, _ = window.read(timeout=100)
-
-        event_clean = str(event.split(":")[0]).replace(" ", "") if ":" in str(event) else event
-
-        if not first_question_asked:
-            window["welcome_message"].update("Should I be Mean or Nice?")
-            window["quote_of_day"].update("1: Mean    2: Nice")
-        if event_clean == "1" and not first_question_asked:
-            window["welcome_message"].update("What jokes to tell?")
-            window["quote_of_day"].update("0: Exit   1: Racist   2: Sexist   3: Dad   4: Dark Humor")
-            first_question_asked = True
-            continue
-
-        if first_question_asked:
-            if event_clean == "0":
-                break
 
-            mapping = {
-                "1": "racist_jokes",
-                "2": "sexist_jokes",
-                "3": "dad_jokes",
-                "4": "dark_humor",
-                "5": "my_quotes",
-            }
-
-            if str(event_clean) in mapping:
-                records[name].append(mapping[str(event_clean)])
-                window["welcome_message"].update(f"Added {mapping[str(event_clean)].replace('_', ' ')}, Any more?")
-                event = None
-                continue
+def pick_index(category: str = QUOTE_OF_DAY_CATEGORY) -> int:
+    """Pick an index into ``content[category]`` avoiding recent picks from that category."""
+    size = len(content[category])
+    sampler = samplers.get(category)
+    if sampler is None or sampler.size != size:
+        sampler = samplers[category] = RecencySampler(size)
+    return sampler.pick()
 
-        # If user chose '2' (nice path) - add dad_jokes then exit
-        if event_clean == "2"  and not first_question_asked:
-            records[name].append("dad_jokes")
-            break
-
-    window["welcome_message"].update("")
+def save_records() -> None:
+    """Write everyone's content preferences to disk."""
     try:
-        with Path("records.py").open("w", encoding="utf-8") as f:
-            f.write(f"records = {records}")
+        preferences.save()
     except OSError:
-        logger.exception("Failed to write to records.py")
+        logger.exception("Failed to write to %s", preferences.path)
 
 
-def display_joke(window: Sg.Window, name_recognized: str) -> None:
-    """Display a joke or quote based on the recognized person's preferences."""
-    random_number = random.randint(1, len(records[name_recognized]) - 1)
-    chosen_type_of_jokes = records[name_recognized][random_number]
+def display_joke(window: Sg.Window, names_recognized: list[str]) -> None:
+    """Greet everyone recognized and display a joke or quote from one of their preferences."""
+    with_preferences = [name for name in names_recognized if preferences.get(name)]
+    greeting_message = random.choice(GREETING_MESSAGES)
+    window["welcome_message"].update(f"{greeting_message}, {' & '.join(names_recognized)}!")
+    if not with_preferences:
+        return
 
-    random_number = random.randint(1, len(GREETING_MESSAGES) - 1)
-    greeting_message = GREETING_MESSAGES[random_number]
+    chosen_type_of_jokes = random.choice(preferences.get(random.choice(with_preferences)))
 
-    lists_map = {
-        "racist_jokes": racist_jokes,
-        "sexist_jokes": sexist_jokes,
-        "dad_jokes": dad_jokes,
-        "dark_humor": dark_humor,
-        "my_quotes": my_quotes,
-    }
-    chosen_list_of_jokes = lists_map.get(chosen_type_of_jokes, [])
+    chosen_list_of_jokes = content.get(chosen_type_of_jokes)
+    if not chosen_list_of_jokes:
+        return
 
-    window["welcome_message"].update(f"{greeting_message}, {name_recognized}!")
-    i = pick_index(chosen_list_of_jokes)
+    i = pick_index(chosen_type_of_jokes)
     window["quote_of_day"].update(chosen_list_of_jokes[i])
 
-def collect_name(window: Sg.Window) -> str:
-    """Collect name input from GUI."""
-    name = ""
-
-    while True:
-        event, _ = window.read(timeout=100)
-        event_clean = event.replace(":", "")
-        event_clean = re.sub(r"\d", "", event_clean)
-
-        if len(event_clean) == 1 and event_clean.isalpha():
-            name += event_clean
-            window["welcome_message"].update(f"Enter Name: {name}")
-        if "BackSpace" in event or "Delete" in event:
-            name = name[:-1]
-            window["welcome_message"].update(f"Enter Name: {name}")
-
-        if "Return" in event:
-            if not name:
-                window["quote_of_day"].update("Name cannot be blank")
-            elif ((Path("dataset") / name).exists() and (Path("dataset") / name).is_dir()) or name in records:
-                window["quote_of_day"].update(f"{name} is already taken, please use another")
-            else:
-                return name
-
-def add_new_person(current_quote: str, window: Sg.Window) -> None:
-    """Register a new person via GUI input."""
-    collecting_name = False
-
-    while True:
-        event, _ = window.read(timeout=100)
-        if event == Sg.WIN_CLOSED or "Escape" in str(event):
-            window["welcome_message"].update("")
-            window["quote_of_day"].update(current_quote)
+def menu_categories() -> dict[str, str]:
+    """Return the choosable categories keyed 1-9, ``CONTENT_MENU`` first, then any others found."""
+    found = [category for category in content.categories() if category != QUOTE_OF_DAY_CATEGORY]
+    ordered = [category for category in CONTENT_MENU if category in found]
+    ordered += [category for category in found if category not in ordered]
+    return {str(key): category for key, category in enumerate(ordered[:9], start=1)}
+
+
+def seconds_until_midnight() -> float:
+    """Return the seconds left until the date changes in ``settings.TIMEZONE``."""
+    tz = pytz.timezone(settings.TIMEZONE)
+    now = datetime.now(tz)
+    midnight = tz.localize(datetime.combine(now.date() + timedelta(days=1), datetime.min.time()))
+    return (midnight - now).total_seconds()
+
+
+def key_name(event: object) -> str:
+    """Return the key of a keyboard event such as ``"a:38"`` without its keycode."""
+    return str(event).split(":")[0].replace(" ", "")
+
+
+class BackgroundServices:
+    """Import and start the weather and vision stacks off the GUI thread.
+
+    Importing cv2, numpy and the Open-Meteo client takes seconds on a Pi, so the
+    window is painted first and this loads them afterwards. ``ready`` is set
+    once both have been started (or failed to).
+    """
+
+    def __init__(self, window: Sg.Window, weather: list[tuple] | None = None) -> None:
+        """Set the window the services post their events to.
+
+        :param window: The finalized mirror window
+        :param weather: Saved weather already on screen, kept until the first fetch
+        """
+        self.window = window
+        self.weather = weather
+        self.ready = threading.Event()
+        self.weather_worker: WeatherWorker | None = None
+        self.recognition: RecognitionService | None = None
+
+    def start(self) -> None:
+        """Begin loading in the background."""
+        threading.Thread(target=self._load, name="startup", daemon=True).start()
+
+    def _load(self) -> None:
+        """Import each stack and start it, timing how long each took."""
+        try:
+            start = time.perf_counter()
+            from weather import WeatherWorker  # noqa: PLC0415
+
+            # Fetch weather in the background; results arrive as "weather_updated" events
+            self.weather_worker = WeatherWorker(self.window.write_event_value, last=self.weather)
+            self.weather_worker.start()
+            logger.info("Weather loaded in %.2fs", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            from facial_recognition.recognize import RecognitionService  # noqa: PLC0415
+
+            # Start recognition; results arrive as "recognized_faces" / "no_recognition" events
+            self.recognition = RecognitionService(self.window)
+            self.recognition.start()
+            logger.info("Face recognition loaded in %.2fs", time.perf_counter() - start)
+        except Exception:
+            logger.exception("Failed to start background services")
+        finally:
+            self.ready.set()
+
+    def enroll(self, name: str, stop_event: threading.Event | None = None) -> None:
+        """Capture pictures of ``name`` and add them to the model (blocking).
+
+        :param name: Person to enroll
+        :param stop_event: Set to cancel taking pictures
+        """
+        from facial_recognition.register import register_person  # noqa: PLC0415
+
+        self.ready.wait()
+        if self.recognition is None:
+            msg = "Face recognition failed to load"
+            raise RuntimeError(msg)
+
+        # Recognition lets go of the camera while pictures are taken, and the model
+        # it holds is updated in memory before the camera is reopened
+        with self.recognition.paused():
+            register_person(self.window, name, stop_event)  # Capture images using rpicam-vid
+            self.recognition.add_person(name)
+        self.recognition.start()  # Nothing was running yet if this is the first person
+
+    def stop(self) -> None:
+        """Stop whatever has been started."""
+        if self.weather_worker is not None:
+            self.weather_worker.stop()
+        if self.recognition is not None:
+            self.recognition.stop(timeout=1.0)
+
+
+class MirrorApp:
+    """Event dispatcher and screen state machine for the mirror.
+
+    There is a single blocking ``window.read`` whose timeout is the time until
+    the next scheduled deadline (quote rollover, stale weather, prompt
+    timeout), so the loop only wakes up for an event or a timer. Each screen
+    (idle, entering a name, taking pictures, choosing content, ...) is a state
+    with its own handler instead of a nested read loop.
+    """
+
+    # States where Escape or PROMPT_TIMEOUT closes the prompt
+    PROMPTS = ("name", "confirm", "mean_or_nice", "categories", "edit_name")
+
+    def __init__(self, window: Sg.Window, services: BackgroundServices) -> None:
+        """Start idle with nothing scheduled.
+
+        :param window: The finalized mirror window
+        :param services: Weather and recognition, used to enroll new people
+        """
+        self.window = window
+        self.services = services
+        self.state = "idle"
+        self.timers: dict[str, tuple[float, Callable[[], None]]] = {}
+        self.current_quote = ""
+        self.last_date: date | None = None
+        self.name = ""
+        self.enroll_stop = threading.Event()
+        self.menu: dict[str, str] = {}
+        self.weather: list[tuple] | None = None
+        self.handlers: dict[str, Callable[[object, dict], None]] = {
+            "idle": self.on_idle,
+            "name": self.on_name,
+            "confirm": self.on_confirm,
+            "enrolling": self.on_enrolling,
+            "registered": lambda _event, _values: None,
+            "mean_or_nice": self.on_mean_or_nice,
+            "categories": self.on_categories,
+            "edit_name": self.on_edit_name,
+        }
+
+    # ---------- Timers ---------- #
+    def schedule(self, name: str, delay: float, callback: Callable[[], None]) -> None:
+        """Run ``callback`` after ``delay`` seconds, replacing any timer called ``name``."""
+        self.timers[name] = (time.monotonic() + delay, callback)
+
+    def cancel(self, name: str) -> None:
+        """Drop the timer called ``name`` if it is scheduled."""
+        self.timers.pop(name, None)
+
+    def next_timeout(self) -> int | None:
+        """Return milliseconds until the earliest timer, or None to block until an event."""
+        if not self.timers:
+            return None
+        due = min(deadline for deadline, _ in self.timers.values())
+        return max(0, math.ceil((due - time.monotonic()) * 1000))
+
+    def run_due_timers(self) -> None:
+        """Run and remove every timer whose deadline has passed."""
+        now = time.monotonic()
+        for name, (deadline, callback) in list(self.timers.items()):
+            if deadline <= now and self.timers.get(name) == (deadline, callback):
+                del self.timers[name]
+                callback()
+
+    # ---------- Main loop ---------- #
+    def run(self) -> None:
+        """Dispatch events until the window is closed or Escape is pressed while idle.
+
+        Call show_quote_of_day first; it paints the quote and schedules the next one.
+        """
+        while True:
+            event, values = self.window.read(timeout=self.next_timeout())
+            if event == Sg.WIN_CLOSED:
+                break
+            start = time.perf_counter()
+            self.run_due_timers()
+            if event == Sg.TIMEOUT_EVENT:
+                continue
+            if not self.dispatch(event, values or {}):
+                break
+            EVENT_SECONDS.observe(time.perf_counter() - start)
+
+    def dispatch(self, event: str, values: dict) -> bool:
+        """Handle one window event; return False if the app should exit."""
+        # Show weather fetched by the background worker whatever screen is up
+        if event == "weather_updated":
+            self.show_weather(values["weather_updated"])
+            return True
+
+        if "Escape" in str(event):
+            if self.state == "idle":
+                return False
+            if self.state in self.PROMPTS:
+                self.close_prompt()
+            elif self.state == "enrolling":
+                self.cancel_enrollment()
+            return True
+
+        # Key presses ("a:38", "Return:36", ...) keep an open prompt alive
+        if self.state in self.PROMPTS and ":" in str(event):
+            self.schedule("prompt_timeout", PROMPT_TIMEOUT, self.close_prompt)
+        self.handlers[self.state](event, values)
+        return True
+
+    def enter(self, state: str, welcome: str | None = None, quote: str | None = None) -> None:
+        """Switch to ``state`` and optionally replace the two message lines."""
+        self.state = state
+        if welcome is not None:
+            self.window["welcome_message"].update(welcome)
+        if quote is not None:
+            self.window["quote_of_day"].update(quote)
+        if state in self.PROMPTS:
+            self.schedule("prompt_timeout", PROMPT_TIMEOUT, self.close_prompt)
+        else:
+            self.cancel("prompt_timeout")
+
+    def show_quote_of_day(self) -> None:
+        """Pick a new quote when the date changes, then wait for the next midnight."""
+        today = datetime.now(pytz.timezone(settings.TIMEZONE)).date()
+        if self.last_date != today:
+            self.current_quote = content[QUOTE_OF_DAY_CATEGORY][pick_index()]
+            self.last_date = today
+            if self.state == "idle":
+                self.window["quote_of_day"].update(self.current_quote)
+        self.schedule("quote_of_day", seconds_until_midnight(), self.show_quote_of_day)
+
+    def show_weather(self, weather: list[tuple] | None = None) -> None:
+        """Draw ``weather`` (or redraw the last one) and wake up again once it goes stale."""
+        if weather is not None:
+            self.weather = weather
+        if not self.weather:
             return
-
-        if not collecting_name:
-            window["welcome_message"].update("Enter Name:")
-            window["quote_of_day"].update("")
-            collecting_name = True
-            name = collect_name(window)
-            window["welcome_message"].update("Press Enter to Start Taking Pictures")
-            window["quote_of_day"].update("Please stand ~3 feet away and move slowly to capture angles")
-            continue
-
-        if collecting_name and "Return" in event:
-            try:
-                window["welcome_message"].update("Taking Pictures...")
-                window["quote_of_day"].update("")
-                window.refresh()
-                register_person(window, name)  # Capture images using rpicam-still
-                train_model()  # Rebuild LBPH model
-                window["welcome_message"].update("Successfully Registered!")
-                window["progress_bar"].update(visible=False)
-                window.refresh()
-                time.sleep(2)
-                choose_what_to_display(window, name)
-            except Exception:
-                logger.exception("Error registering new person")
-                window["quote_of_day"].update(f"Error registering {name}")
-                return
-
-            window["welcome_message"].update("")
-            window["quote_of_day"].update(current_quote)
+        try:
+            update_weather(self.window, self.weather)
+        except (KeyError, TypeError, ValueError):
+            logger.exception("Failed to display weather")
             return
+        fetched_at = self.weather[0][2].get("fetched_at", 0)
+        stale_in = fetched_at + settings.WEATHER_STALE_AFTER - time.time()
+        if stale_in > 0:
+            self.schedule("weather_stale", stale_in + 1, self.show_weather)
+        else:
+            self.cancel("weather_stale")
+
+    def show_idle(self) -> None:
+        """Go back to the resting screen with today's quote."""
+        self.window["progress_bar"].update(visible=False)
+        self.enter("idle", "", self.current_quote)
+
+    def close_prompt(self) -> None:
+        """Leave whatever prompt is open, keeping content preferences chosen so far."""
+        if self.state in ("mean_or_nice", "categories"):
+            save_records()
+        self.show_idle()
+
+    # ---------- Idle ---------- #
+    def on_idle(self, event: object, values: dict) -> None:
+        """Greet recognized people and start enrollment on Return."""
+        # Handle recognized faces
+        if event == "recognized_faces":
+            logger.info("Face event detected!")
+            names_recognized = values.get("recognized_faces")
+            if names_recognized:
+                display_joke(self.window, names_recognized)
 
-def change_person_preferences(window: Sg.Window, name: str) -> None:
-    """Change preferences for an existing person."""
-    window["welcome_message"].update("Change Person's Preferences")
-
-    while True:
-        event, _ = window.read(timeout=100)
-        if event == Sg.WIN_CLOSED or "Escape" in str(event):
-            break
-
-        event_clean = event.replace(":", "")
-        event_clean = re.sub(r"\d", "", event_clean)
-
-        if len(event_clean) == 1 and event_clean.isalpha():
-            name += event_clean
-            window["welcome_message"].update(f"Enter Name: {name}")
-        if "BackSpace" in event or "Delete" in event:
-            name = name[:-1]
-            window["welcome_message"].update(f"Enter Name: {name}")
-
-        if "Return" in event or "Enter" in event:
-            window["welcome_message"].update(f"Enter Name: {name}")
-
-            if name not in records:
-                window["quote_of_day"].update("Person not found. Press Shift to list all people registered.")
+        # Handle no recognition
+        elif event == "no_recognition":
+            logger.info("No face recognized.")
+            self.window["quote_of_day"].update(self.current_quote)
+            self.window["welcome_message"].update("")
 
+        # Add new person
+        elif "Return" in str(event) or event == "Enter":
+            self.name = ""
+            self.enter("name", "Enter Name:", "")
+
+    # ---------- Enrollment ---------- #
+    def edit_name(self, event: object) -> bool:
+        """Apply a letter or backspace key press to ``self.name``; return True if it changed."""
+        key = re.sub(r"\d", "", str(event).replace(":", ""))
+        if len(key) == 1 and key.isalpha():
+            self.name += key
+        elif "BackSpace" in str(event) or "Delete" in str(event):
+            self.name = self.name[:-1]
+        else:
+            return False
+        self.window["welcome_message"].update(f"Enter Name: {self.name}")
+        return True
+
+    def on_name(self, event: object, _values: dict) -> None:
+        """Collect a new, unused name and ask to start taking pictures."""
+        if self.edit_name(event) or "Return" not in str(event):
+            return
+        if not self.name:
+            self.window["quote_of_day"].update("Name cannot be blank")
+        elif (Path("dataset") / self.name).is_dir() or self.name in preferences:
+            self.window["quote_of_day"].update(f"{self.name} is already taken, please use another")
+        else:
+            self.enter("confirm", "Press Enter to Start Taking Pictures",
+                       "Please stand ~3 feet away and move slowly to capture angles")
+
+    def on_confirm(self, event: object, _values: dict) -> None:
+        """Start capturing pictures in the background on Return."""
+        if "Return" not in str(event):
+            return
+        self.enter("enrolling", "Taking Pictures...", "")
+        self.window["progress_bar"].update(0, visible=True)
+        self.enroll_stop = threading.Event()
+        threading.Thread(target=self.enroll, args=(self.name, self.enroll_stop), name="enroll", daemon=True).start()
+
+    def enroll(self, name: str, stop_event: threading.Event) -> None:
+        """Capture pictures and add ``name`` to the model, posting the outcome (worker thread)."""
+        from facial_recognition.register import EnrollmentStoppedError  # noqa: PLC0415
+
+        try:
+            self.services.enroll(name, stop_event)
+        except EnrollmentStoppedError as e:
+            logger.info("%s", e)
+            self.window.write_event_value("register_failed", f"Taking pictures of {name} took too long, try again")
+        except Exception:
+            logger.exception("Error registering new person")
+            self.window.write_event_value("register_failed", f"Error registering {name}")
+        else:
+            self.window.write_event_value("register_done", name)
+
+    def cancel_enrollment(self) -> None:
+        """Stop taking pictures and go back to the resting screen."""
+        self.enroll_stop.set()
+        self.show_idle()
+
+    def on_enrolling(self, event: object, values: dict) -> None:
+        """Show capture progress and move on once the new person is saved."""
+        if event == "register_progress":
+            count, status = values["register_progress"]
+            self.window["progress_bar"].update(count)
+            self.window["quote_of_day"].update(status)
+        elif event == "register_done":
+            self.window["progress_bar"].update(visible=False)
+            self.enter("registered", "Successfully Registered!", "")
+            self.schedule("registered", REGISTERED_MESSAGE_TIME, self.ask_mean_or_nice)
+        elif event == "register_failed":
+            self.show_idle()
+            self.window["quote_of_day"].update(values["register_failed"])
+
+    # ---------- Content preferences ---------- #
+    def change_person_preferences(self) -> None:
+        """Ask for an existing person's name and choose their content again."""
+        self.name = ""
+        self.enter("edit_name", "Change Person's Preferences")
+
+    def on_edit_name(self, event: object, _values: dict) -> None:
+        """Collect an existing name, then clear and re-ask that person's preferences."""
+        if self.edit_name(event):
+            return
+        if "Return" in str(event) or "Enter" in str(event):
+            if self.name not in preferences:
+                self.window["quote_of_day"].update("Person not found. Press Shift to list all people registered.")
             else:
-                records[name] = []
-                choose_what_to_display(window, name)
+                preferences.set(self.name, [])
+                self.ask_mean_or_nice()
+
+    def ask_mean_or_nice(self) -> None:
+        """Ask what type of content ``self.name`` wants displayed."""
+        if self.name not in preferences:
+            preferences.set(self.name, [])
+        self.enter("mean_or_nice", "Should I be Mean or Nice?", "1: Mean    2: Nice")
+
+    def on_mean_or_nice(self, event: object, _values: dict) -> None:
+        """Offer joke categories on 1, or settle for dad jokes on 2."""
+        key = key_name(event)
+        if key == "1":
+            self.menu = menu_categories()
+            options = "   ".join(f"{key}: {category.replace('_', ' ').title()}" for key, category in self.menu.items())
+            self.enter("categories", "What jokes to tell?", f"0: Exit   {options}")
+        elif key == "2":
+            preferences.add(self.name, "dad_jokes")
+            self.finish_preferences()
+
+    def on_categories(self, event: object, _values: dict) -> None:
+        """Add each chosen category until 0 is pressed."""
+        key = key_name(event)
+        if key == "0":
+            self.finish_preferences()
+        elif key in self.menu:
+            preferences.add(self.name, self.menu[key])
+            self.window["welcome_message"].update(f"Added {self.menu[key].replace('_', ' ')}, Any more?")
+
+    def finish_preferences(self) -> None:
+        """Save the chosen content and return to the resting screen."""
+        save_records()
+        self.show_idle()
+
 
 def main() -> None:
     """Run the Smart Mirror application."""
+    started = time.perf_counter()
     os.environ["DISPLAY"] = ":0.0"
 
-    window = Sg.Window(
+    # Route element updates through a view that skips ones that would not change anything
+    window = WindowView(Sg.Window(
         "Smart Mirror",
         create_weather_layout(),
         no_titlebar=False,
         resizable=True,
         return_keyboard_events=True,
-    ).Finalize()
+    ).Finalize())
 
     window.set_cursor("none")
     window.Maximize()
 
-    last_date = None
-    last_update = 0.0
-    current_quote = ""
-    name_already_detected = False
-
-    # Initial weather update
-    with contextlib.suppress(Exception):
-        update_weather(window)
-
-    # Start recognition thread
-    recog_stop = threading.Event()
-    recog_thread = threading.Thread(target=recognize_faces, args=(window, recog_stop), daemon=True)
-    recog_thread.start()
-
-    while True:
-        event, values = window.read(timeout=100)
-        if event == Sg.WIN_CLOSED or "Escape" in str(event):
-            break
-
-        # Update weather periodically
-        if time.time() - last_update >= float(settings.UPDATE_INTERVAL):
-            with contextlib.suppress(Exception):
-                update_weather(window)
-            last_update = time.time()
-
-        # Update daily quote
-        today = datetime.now(pytz.timezone(settings.TIMEZONE)).date()
-        if last_date != today:
-            i = pick_index()
-            window["quote_of_day"].update(quotes[i])
-            current_quote = quotes[i]
-            last_date = today
-
-        # Handle recognized faces
-        if event == "recognized_face":
-            logger.info("Face event detected!")
-            name_recognized = values.get("recognized_face")
-            if name_recognized and not name_already_detected:
-                name_already_detected = True
-                display_joke(window, name_recognized)
-
-        # Handle no recognition
-        if event == "no_recognition":
-            name_already_detected = False
-            logger.info("No face recognized.")
-            window["quote_of_day"].update(current_quote)
-            window["welcome_message"].update("")
-
-        # Add new person
-        if "Return" in str(event) or event == "Enter":
-            add_new_person(current_quote, window)
-            recog_thread.start()
-
-    recog_stop.set()
-    recog_thread.join(timeout=1.0)
+    # Paint the quote and the saved weather before loading anything slow
+    snapshot = load_snapshot()
+    services = BackgroundServices(window, snapshot)
+    app = MirrorApp(window, services)
+    app.show_quote_of_day()
+    app.show_weather(snapshot)
+    window.refresh()
+    logger.info("First paint %.2fs after main() started", time.perf_counter() - started)
+
+    exporter = metrics.MetricsExporter()
+    exporter.start()
+    services.start()
+    app.run()
+
+    services.stop()
+    exporter.stop()
+    logger.info("GUI updates: %(applied)d applied, %(skipped)d skipped", window.stats())
     window.close()
 
 
@@ -0,0 +1,365 @@
+"""Counters, gauges and latency histograms for the mirror's hot paths.
+
+Modules create their metrics once at import time and record into them::
+
+    DETECT_SECONDS = metrics.histogram("mirror_detect_seconds", "Face detection time per frame")
+    ...
+    DETECT_SECONDS.observe(time.perf_counter() - start)
+
+Metrics with labels are looked up with ``labels(...)``, best done once outside
+the loop. With ``METRICS_ENABLED`` off, every factory returns one shared no-op
+metric, so instrumented code costs an empty method call and nothing is kept.
+
+:class:`MetricsExporter` serves the registry on localhost in the Prometheus
+text format at ``/metrics`` and as JSON at ``/metrics.json``, and can also
+write the JSON to ``METRICS_DUMP_FILE`` on an interval.
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from configuration.settings import METRICS_DUMP_FILE, METRICS_DUMP_INTERVAL, METRICS_ENABLED, METRICS_PORT
+from fileio import atomic_write_text
+
+if TYPE_CHECKING:
+    import http.server
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the default histogram buckets, from a fast predict to a slow fetch
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """A value that only goes up, such as frames processed."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount`` to the counter."""
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return (suffix, extra labels, value) for each exposed series."""
+        return [("", {}, self.value)]
+
+    def to_json(self) -> float:
+        """Return the value for the JSON dump."""
+        return self.value
+
+
+class Gauge:
+    """A value that can go up and down, such as frames per second."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Replace the current value."""
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount``, which may be negative, to the gauge."""
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return (suffix, extra labels, value) for each exposed series."""
+        return [("", {}, self.value)]
+
+    def to_json(self) -> float:
+        """Return the value for the JSON dump."""
+        return self.value
+
+
+class Histogram:
+    """Counts of observations in cumulative buckets, plus their sum and count."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Start with every bucket empty."""
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation, e.g. a latency in seconds."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return the ``_bucket``, ``_sum`` and ``_count`` series."""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        series: list[tuple[str, dict[str, str], float]] = []
+        cumulative = 0
+        for bound, bucket_count in zip((*self.buckets, float("inf")), counts, strict=True):
+            cumulative += bucket_count
+            series.append(("_bucket", {"le": format_value(bound)}, cumulative))
+        series.append(("_sum", {}, total))
+        series.append(("_count", {}, count))
+        return series
+
+    def to_json(self) -> dict[str, Any]:
+        """Return count, sum, mean and cumulative bucket counts for the JSON dump."""
+        series = self.samples()
+        count, total = series[-1][2], series[-2][2]
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else None,
+            "buckets": {labels["le"]: value for _, labels, value in series[:-2]},
+        }
+
+
+class NullMetric:
+    """Stand-in for every metric while metrics are disabled; records nothing."""
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Do nothing."""
+
+    def set(self, value: float) -> None:
+        """Do nothing."""
+
+    def observe(self, value: float) -> None:
+        """Do nothing."""
+
+    def labels(self, *_: str) -> "NullMetric":
+        """Return the same no-op metric."""
+        return self
+
+
+NULL_METRIC = NullMetric()
+
+
+class Family:
+    """A named metric and one child per combination of label values."""
+
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: tuple[str, ...], make: Any) -> None:
+        """Describe the metric; children are created by :meth:`labels`."""
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = labelnames
+        self.make = make
+        self.children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        """Return the child for ``values``, one per label name, creating it on first use."""
+        if len(values) != len(self.labelnames):
+            msg = f"{self.name} takes labels {self.labelnames}, got {values}"
+            raise ValueError(msg)
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            with self._lock:
+                child = self.children.setdefault(key, self.make())
+        return child
+
+    def items(self) -> list[tuple[tuple[str, ...], Any]]:
+        """Return (label values, child) pairs sorted by label values, safe while children are added."""
+        with self._lock:
+            return sorted(self.children.items())
+
+
+def format_value(value: float) -> str:
+    """Format a sample value or bucket bound the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Return ``{a="1",b="2"}`` with values escaped, or an empty string for no labels."""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        escaped = value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Registry:
+    """Every metric created in this process, by name."""
+
+    def __init__(self, *, enabled: bool = METRICS_ENABLED) -> None:
+        """Create an empty registry; when not ``enabled`` it hands out no-op metrics."""
+        self.enabled = enabled
+        self.families: dict[str, Family] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, help_text: str, kind: str, labels: tuple[str, ...], make: Any) -> Any:
+        """Return the family ``name``, or its only child if it has no labels."""
+        if not self.enabled:
+            return NULL_METRIC
+        with self._lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = Family(name, help_text, kind, labels, make)
+            elif family.kind != kind or family.labelnames != labels:
+                msg = f"Metric {name} already registered as a {family.kind} with labels {family.labelnames}"
+                raise ValueError(msg)
+        return family if labels else family.labels()
+
+    def counter(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Any:
+        """Return a counter, or a family of counters looked up with ``labels(...)``."""
+        return self._register(name, help_text, "counter", labels, Counter)
+
+    def gauge(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Any:
+        """Return a gauge, or a family of gauges looked up with ``labels(...)``."""
+        return self._register(name, help_text, "gauge", labels, Gauge)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Any:
+        """Return a histogram, or a family of histograms looked up with ``labels(...)``."""
+        return self._register(name, help_text, "histogram", labels, lambda: Histogram(buckets))
+
+    def collect(self) -> list[Family]:
+        """Return every family sorted by name, safe while modules are still registering metrics."""
+        with self._lock:
+            return sorted(self.families.values(), key=lambda f: f.name)
+
+    def to_text(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, child in family.items():
+                labels = dict(zip(family.labelnames, values, strict=True))
+                for suffix, extra, value in child.samples():
+                    lines.append(f"{family.name}{suffix}{format_labels(labels | extra)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> dict[str, Any]:
+        """Return every metric as ``{name: value}``, keyed by ``label=value,...`` when labelled."""
+        snapshot: dict[str, Any] = {"time": time.time()}
+        for family in self.collect():
+            if family.labelnames:
+                snapshot[family.name] = {
+                    ",".join(f"{n}={v}" for n, v in zip(family.labelnames, values, strict=True)): child.to_json()
+                    for values, child in family.items()
+                }
+            else:
+                snapshot[family.name] = family.labels().to_json()
+        return snapshot
+
+
+registry = Registry()
+counter = registry.counter
+gauge = registry.gauge
+histogram = registry.histogram
+
+
+class MetricsExporter:
+    """Serve the registry over HTTP on localhost and/or dump it to a JSON file.
+
+    Does nothing unless metrics are enabled. The server and the dump run on
+    daemon threads, so a slow scrape never touches the GUI or the pipeline.
+    """
+
+    def __init__(
+        self,
+        registry: Registry = registry,
+        port: int = METRICS_PORT,
+        dump_file: Path = METRICS_DUMP_FILE,
+        dump_interval: float = METRICS_DUMP_INTERVAL,
+    ) -> None:
+        """Set where metrics go; nothing starts until :meth:`start`."""
+        self.registry = registry
+        self.port = port
+        self.dump_file = dump_file
+        self.dump_interval = dump_interval
+        self.server: http.server.ThreadingHTTPServer | None = None
+        self.stop_event = threading.Event()
+
+    def start(self) -> None:
+        """Start the endpoint and the periodic dump, whichever are configured."""
+        if not self.registry.enabled:
+            return
+        if self.port:
+            try:
+                self.server = self.serve()
+            except OSError as e:
+                logger.warning("Could not serve metrics on port %d: %s", self.port, e)
+            else:
+                logger.info("Serving metrics on http://127.0.0.1:%d/metrics", self.server.server_port)
+        if self.dump_interval:
+            threading.Thread(target=self._dump_loop, name="metrics-dump", daemon=True).start()
+
+    def serve(self) -> "http.server.ThreadingHTTPServer":
+        """Start the HTTP server on its own thread and return it."""
+        import http.server  # noqa: PLC0415 - only needed once metrics are enabled
+
+        registry = self.registry
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body, content_type = registry.to_text().encode(), "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.to_json()).encode(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_: Any) -> None:
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+    def dump(self) -> None:
+        """Write the current metrics to ``dump_file`` atomically."""
+        atomic_write_text(self.dump_file, json.dumps(self.registry.to_json(), indent=1))
+
+    def _dump_loop(self) -> None:
+        """Dump every ``dump_interval`` seconds until stopped."""
+        while not self.stop_event.wait(self.dump_interval):
+            try:
+                self.dump()
+            except OSError:
+                logger.exception("Failed to write %s", self.dump_file)
+
+    def stop(self) -> None:
+        """Shut the server down and write a last dump."""
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.registry.enabled and self.dump_interval:
+            try:
+                self.dump()
+            except OSError:
+                logger.exception("Failed to write %s", self.dump_file)
@@ -0,0 +1,94 @@
+"""Per-person content preferences, kept in memory and saved atomically as JSON."""
+
+import ast
+import json
+import logging
+import threading
+from pathlib import Path
+
+from configuration.records import records as legacy_records
+from configuration.settings import PREFERENCES_FILE
+from fileio import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+# records.py written to the working directory by older versions
+LEGACY_RECORDS_FILE = Path("records.py")
+
+
+def read_legacy_records(path: Path = LEGACY_RECORDS_FILE) -> dict[str, list[str]]:
+    """Return the ``records = {...}`` dict from an old records.py, or an empty dict."""
+    try:
+        source = path.read_text(encoding="utf-8")
+        _, _, literal = source.partition("=")
+        records = ast.literal_eval(literal.strip())
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    return records if isinstance(records, dict) else {}
+
+
+class PreferenceStore:
+    """Thread-safe map of person name to the content categories they want.
+
+    The file is read on first use and every lookup after that is a dict lookup
+    with no file I/O. :meth:`save` writes to a temporary file in the same
+    directory and renames it over the old one, so a crash mid-write never
+    loses existing preferences.
+    """
+
+    def __init__(self, path: Path = PREFERENCES_FILE) -> None:
+        """Point the store at ``path``; nothing is read until first use."""
+        self.path = path
+        self.lock = threading.RLock()
+        self._records: dict[str, list[str]] | None = None
+
+    @property
+    def records(self) -> dict[str, list[str]]:
+        """Return the loaded records, reading the file on first access."""
+        if self._records is None:
+            with self.lock:
+                if self._records is None:
+                    self._records = self._load()
+        return self._records
+
+    def _load(self) -> dict[str, list[str]]:
+        """Read the JSON file, falling back to preferences saved by older versions."""
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                return {name: list(categories) for name, categories in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError):
+            logger.exception("Failed to read %s, starting with no preferences", self.path)
+            return {}
+
+        migrated = {**legacy_records, **read_legacy_records()}
+        if migrated:
+            logger.info("Migrating preferences for %d people to %s", len(migrated), self.path)
+        return {name: list(categories) for name, categories in migrated.items()}
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if ``name`` has an entry, even an empty one."""
+        return name in self.records
+
+    def get(self, name: str) -> tuple[str, ...]:
+        """Return the categories ``name`` chose, empty if none."""
+        with self.lock:
+            return tuple(self.records.get(name, ()))
+
+    def set(self, name: str, categories: list[str]) -> None:
+        """Replace the categories for ``name``."""
+        with self.lock:
+            self.records[name] = list(categories)
+
+    def add(self, name: str, category: str) -> None:
+        """Append ``category`` to the categories for ``name``."""
+        with self.lock:
+            self.records.setdefault(name, []).append(category)
+
+    def save(self) -> None:
+        """Write every record to disk atomically."""
+        with self.lock:
+            atomic_write_text(self.path, json.dumps(self.records, indent=2, sort_keys=True))
+
+preferences = PreferenceStore()
@@ -0,0 +1,95 @@
+"""Weighted random picks that avoid repeating recent choices."""
+
+import random
+from collections import Counter, deque
+
+from configuration.settings import QUOTE_HISTORY, QUOTE_REPEAT_PENALTY
+
+
+class RecencySampler:
+    """Pick indices in ``range(size)`` with recently picked ones made less likely.
+
+    An index picked ``k`` times among the last ``history`` picks has weight
+    ``penalty ** k``; every other index has weight 1. Weights live in a Fenwick
+    tree, so a pick and the weight changes it causes cost O(log size) instead
+    of rebuilding a weight list for every call. With a ``history`` of 0 every
+    pick is uniform.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        history: int = QUOTE_HISTORY,
+        penalty: float = QUOTE_REPEAT_PENALTY,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Start with every index equally likely."""
+        self.size = size
+        self.penalty = penalty
+        self.rng = rng or random.Random()
+        self.recent: deque[int] = deque(maxlen=history)
+        self.counts: Counter[int] = Counter()
+        self.weights = [1.0] * size
+
+        # Build the tree in O(size): each node passes its sum on to its parent
+        self.tree = [0.0] * (size + 1)
+        for i in range(1, size + 1):
+            self.tree[i] += 1.0
+            parent = i + (i & -i)
+            if parent <= size:
+                self.tree[parent] += self.tree[i]
+
+    def _add(self, index: int, delta: float) -> None:
+        """Add ``delta`` to the weight of ``index`` in the tree."""
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        """Return the sum of all weights."""
+        total = 0.0
+        i = self.size
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def _find(self, target: float) -> int:
+        """Return the index whose cumulative weight range contains ``target``."""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.tree[nxt] <= target:
+                position = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return min(position, self.size - 1)
+
+    def _set_count(self, index: int, count: int) -> None:
+        """Record that ``index`` appears ``count`` times in the history and reweight it."""
+        if count:
+            self.counts[index] = count
+        else:
+            del self.counts[index]
+        weight = self.penalty ** count
+        self._add(index, weight - self.weights[index])
+        self.weights[index] = weight
+
+    def pick(self) -> int:
+        """Draw an index and penalize it until it falls out of the history."""
+        if not self.size:
+            msg = "Cannot pick from an empty sampler"
+            raise IndexError(msg)
+        index = self._find(self.rng.random() * self.total())
+        if not self.recent.maxlen:
+            # No history to fall out of, so a penalty would never be lifted
+            return index
+
+        if len(self.recent) == self.recent.maxlen:
+            oldest = self.recent[0]
+            self._set_count(oldest, self.counts[oldest] - 1)
+        self.recent.append(index)
+        self._set_count(index, self.counts[index] + 1)
+        return index
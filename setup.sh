@@ -62,11 +62,11 @@ pip3 install \
 echo "=== Verifying installation ==="
 
 # Check rpicam
-if ! command -v rpicam-still &>/dev/null; then
-    echo "❌ rpicam-still not found. Please make sure you are on Raspberry Pi OS Bookworm or Bullseye with libcamera support."
+if ! command -v rpicam-vid &>/dev/null; then
+    echo "❌ rpicam-vid not found. Please make sure you are on Raspberry Pi OS Bookworm or Bullseye with libcamera support."
     exit 1
 else
-    echo "✅ rpicam-still installed"
+    echo "✅ rpicam-vid installed"
 fi
 
 # Check OpenCV
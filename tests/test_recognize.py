@@ -0,0 +1,89 @@
+"""RecognitionStages greeting and no_recognition events as faces come and go."""
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+pytest.importorskip("FreeSimpleGUI")
+
+from configuration.settings import DETECTION_THRESHOLD
+from facial_recognition import recognize
+from facial_recognition.backends import RecognizerBackend
+
+BOX = np.array([[100, 100, 120, 120]], dtype=np.int32)
+NO_FACES = np.empty((0, 4), dtype=np.int32)
+FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+class ScriptedDetector:
+    """Return the next box array from a script on every call."""
+
+    def __init__(self, script: list[np.ndarray]) -> None:
+        """Replay ``script`` in order."""
+        self.script = iter(script)
+
+    def detect(self, _gray: np.ndarray) -> np.ndarray:
+        """Return the next scripted detection."""
+        return next(self.script)
+
+
+class KnownFace(RecognizerBackend):
+    """Recognizer that recognizes every crop as label 0."""
+
+    threshold = 100.0
+
+    def train(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Nothing to train."""
+
+    def update(self, faces: np.ndarray, labels: np.ndarray) -> None:
+        """Nothing to update."""
+
+    def predict(self, _face: np.ndarray) -> tuple[int, float]:
+        """Return a confident match for label 0."""
+        return 0, 10.0
+
+    def load(self) -> None:
+        """Nothing to load."""
+
+    def save(self) -> None:
+        """Nothing to save."""
+
+
+class Window:
+    """Collect posted events."""
+
+    def __init__(self) -> None:
+        """Start with no events."""
+        self.events: list[tuple[str, Any]] = []
+
+    def write_event_value(self, key: str, value: Any) -> None:
+        """Record an event."""
+        self.events.append((key, value))
+
+
+def run_frames(script: list[np.ndarray], monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, Any]]:
+    """Feed one frame per scripted detection through both stages and return the events."""
+    monkeypatch.setattr(recognize, "FaceDetector", lambda: ScriptedDetector(script))
+    window = Window()
+    stages = recognize.RecognitionStages(window, KnownFace(), {0: "bob"})
+    for _ in script:
+        item = stages.detect(FRAME)
+        if item is not None:
+            stages.recognize(item)
+    return window.events
+
+
+def test_intermittent_misses_do_not_end_recognition(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A recognized person the detector sometimes misses is greeted once and never dropped."""
+    events = run_frames([BOX, NO_FACES] * (DETECTION_THRESHOLD * 4), monkeypatch)
+
+    assert events == [("recognized_faces", ["bob"])]
+
+
+def test_person_is_greeted_again_after_no_recognition(monkeypatch: pytest.MonkeyPatch) -> None:
+    """After no_recognition, a person whose track survived is announced again."""
+    script = [BOX] + [NO_FACES] * (DETECTION_THRESHOLD + 1) + [BOX] * 40
+    events = run_frames(script, monkeypatch)
+
+    assert [key for key, _ in events] == ["recognized_faces", "no_recognition", "recognized_faces"]
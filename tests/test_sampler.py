@@ -0,0 +1,30 @@
+"""RecencySampler weights as picks enter and leave the history."""
+
+import random
+
+import pytest
+
+from sampler import RecencySampler
+
+
+def test_penalty_is_lifted_once_a_pick_leaves_the_history() -> None:
+    """Only the last ``history`` picks are penalized, once per appearance."""
+    sampler = RecencySampler(10, history=3, penalty=0.5, rng=random.Random(1))
+    picks = [sampler.pick() for _ in range(50)]
+
+    expected = [1.0] * 10
+    for index in picks[-3:]:
+        expected[index] *= 0.5
+    assert sampler.weights == pytest.approx(expected)
+    assert sampler.total() == pytest.approx(sum(expected))
+
+
+def test_no_history_means_no_penalty() -> None:
+    """With ``history=0`` every index keeps weight 1 however often it is picked."""
+    sampler = RecencySampler(5, history=0, penalty=0.1, rng=random.Random(1))
+    for _ in range(100):
+        sampler.pick()
+
+    assert sampler.weights == [1.0] * 5
+    assert sampler.total() == pytest.approx(5)
+    assert not sampler.counts
@@ -0,0 +1,46 @@
+"""Face crop stores: round trips, staleness and damaged files."""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from facial_recognition.store import FACE_SIZE, STORE_NAME, load_cached, save_faces
+
+
+def make_person(tmp_path: Path, count: int = 3) -> tuple[Path, np.ndarray]:
+    """Write ``count`` sample images and return the person's directory and crops."""
+    person_dir = tmp_path / "ann"
+    person_dir.mkdir()
+    faces = np.random.default_rng(0).integers(0, 256, (count, *FACE_SIZE[::-1]), dtype=np.uint8)
+    for i, face in enumerate(faces):
+        cv2.imwrite(str(person_dir / f"ann_{i}.jpg"), face)
+    return person_dir, faces
+
+
+def test_saved_faces_load_back(tmp_path: Path) -> None:
+    """A store written for the current images is returned as-is and leaves no temporary file."""
+    person_dir, faces = make_person(tmp_path)
+    save_faces(person_dir, faces)
+
+    np.testing.assert_array_equal(load_cached(person_dir), faces)
+    assert sorted(path.name for path in person_dir.iterdir() if path.suffix != ".jpg") == [STORE_NAME]
+
+
+def test_store_is_stale_once_images_change(tmp_path: Path) -> None:
+    """Adding an image invalidates the store."""
+    person_dir, faces = make_person(tmp_path)
+    save_faces(person_dir, faces)
+    cv2.imwrite(str(person_dir / "ann_9.jpg"), faces[0])
+
+    assert load_cached(person_dir) is None
+
+
+def test_truncated_store_is_treated_as_stale(tmp_path: Path) -> None:
+    """A store cut short by a crash is rebuilt instead of raising."""
+    person_dir, faces = make_person(tmp_path)
+    save_faces(person_dir, faces)
+    store = person_dir / STORE_NAME
+    store.write_bytes(store.read_bytes()[: store.stat().st_size // 2])
+
+    assert load_cached(person_dir) is None
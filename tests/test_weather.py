@@ -0,0 +1,141 @@
+"""WeatherWorker against a local stand-in for the Open-Meteo forecast API."""
+
+import http.server
+import queue
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import weather
+from benchmarks.make_weather_fixture import FIXTURE_LOCATIONS, response
+
+LOCATIONS = [
+    {"name": name, "latitude": latitude, "longitude": longitude, "timezone": timezone}
+    for name, latitude, longitude, timezone, _ in FIXTURE_LOCATIONS
+]
+FORECAST = b"".join(
+    response(latitude, longitude, timezone, offset) for _, latitude, longitude, timezone, offset in FIXTURE_LOCATIONS
+)
+ERROR = b'{"error": true, "reason": "Stand-in failure"}'
+
+# Seconds to wait for each posted event before failing the test
+EVENT_TIMEOUT = 10
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """Answer forecast requests with the fixture, or a 400 error, following a script of statuses."""
+
+    def __init__(self, statuses: list[int]) -> None:
+        """Listen on a free localhost port; the last status repeats once the script runs out."""
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.statuses = statuses
+        self.requests = 0
+        self.url = f"http://127.0.0.1:{self.server_port}/v1/forecast"
+
+    def next_status(self) -> int:
+        """Return the status for the next request."""
+        status = self.statuses[min(self.requests, len(self.statuses) - 1)]
+        self.requests += 1
+        return status
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Serve one scripted response per GET."""
+
+    server: StandInServer
+
+    def do_GET(self) -> None:
+        """Send the fixture for 200, otherwise an Open-Meteo style error body."""
+        status = self.server.next_status()
+        body = FORECAST if status == 200 else ERROR
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: Any) -> None:
+        """Keep request lines out of the test output."""
+
+
+@pytest.fixture(autouse=True)
+def working_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run each test in its own directory so snapshots do not leak between tests."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def start_server(statuses: list[int]) -> StandInServer:
+    """Start a stand-in server on a background thread."""
+    server = StandInServer(statuses)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_worker(
+    server: StandInServer, events: int, last: list[tuple] | None = None,
+) -> tuple[list[tuple[str, Any]], weather.WeatherWorker]:
+    """Run a WeatherWorker against ``server`` until it has posted ``events`` events, then stop it."""
+    posted: queue.Queue[tuple[str, Any]] = queue.Queue()
+
+    def fetch() -> list[tuple]:
+        # A fresh in-memory cache per fetch, so every refresh reaches the server
+        return weather.get_weather_data(weather.WeatherClient(url=server.url, backend="memory"), LOCATIONS)
+
+    worker = weather.WeatherWorker(lambda event, data: posted.put((event, data)), fetch=fetch, interval=0.05, last=last)
+    worker.start()
+    try:
+        return [posted.get(timeout=EVENT_TIMEOUT) for _ in range(events)], worker
+    finally:
+        worker.stop()
+        worker.join(EVENT_TIMEOUT)
+        server.shutdown()
+
+
+def test_posts_weather_for_every_location() -> None:
+    """A good fetch is posted as weather_updated, one (daily, hourly, current) per location, and saved."""
+    [(event, data)], _ = run_worker(start_server([200]), events=1)
+
+    assert event == "weather_updated"
+    assert [current["location"] for _, _, current in data] == ["Home", "London"]
+    daily, hourly, current = data[0]
+    assert len(daily) == 7
+    assert len(hourly) > 0
+    assert {"temperature_2m", "time", "timezone", "fetched_at"} <= current.keys()
+    assert weather.load_snapshot() is not None
+
+
+def test_failed_fetch_reposts_last_weather_then_retries() -> None:
+    """After a failure the last good data is posted again, and the next retry fetches fresh data."""
+    server = start_server([200, 400, 200])
+    posted, _ = run_worker(server, events=3)
+
+    (_, first), (_, after_failure), (_, retried) = posted
+    assert after_failure is first
+    assert retried is not first
+    assert [current["location"] for _, _, current in retried] == ["Home", "London"]
+    assert server.requests >= 3
+
+
+def test_snapshot_is_posted_before_a_failing_first_fetch() -> None:
+    """With the API down at startup, the saved snapshot is shown and re-posted on each failure."""
+    [(_, saved)], _ = run_worker(start_server([200]), events=1)
+
+    posted, _ = run_worker(start_server([400]), events=2)
+
+    (_, snapshot), (_, after_failure) = posted
+    assert after_failure is snapshot
+    assert [current["location"] for _, _, current in snapshot] == [current["location"] for _, _, current in saved]
+    assert snapshot[0][0][0] == saved[0][0][0]
+
+
+def test_weather_already_shown_is_not_posted_again() -> None:
+    """Weather the caller already drew from the snapshot is not posted again before the first fetch."""
+    [(_, saved)], _ = run_worker(start_server([200]), events=1)
+    shown = weather.load_snapshot()
+
+    [(_, fetched)], _ = run_worker(start_server([200]), events=1, last=shown)
+
+    assert fetched is not shown
+    assert fetched is not saved
@@ -1,131 +1,306 @@
 """Weather data fetching module using Open-Meteo API."""
 
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
 from datetime import datetime
-from typing import Any
+from functools import partial
+from typing import Any, overload
 
 import openmeteo_requests  # type: ignore[import]
-import pandas as pd  # type: ignore[import]
 import pytz  # type: ignore[import]
 import requests_cache  # type: ignore[import]
 from retry_requests import retry  # type: ignore[import]
 
+import metrics
+from configuration.settings import (
+    UPDATE_INTERVAL,
+    WEATHER_CACHE_BACKEND,
+    WEATHER_CACHE_NAME,
+    WEATHER_JITTER,
+    WEATHER_LOCATIONS,
+    WEATHER_RETRY_INTERVAL,
+    WEATHER_UNITS,
+    WEATHER_URL,
+)
+from weather_snapshot import load_snapshot, save_snapshot
 
-def get_weather_data() -> tuple:
-    """Fetch weather data from Open-Meteo API.
+logger = logging.getLogger(__name__)
 
-    Returns: (daily_dict, hourly_dict, current_weather)
+FETCH_SECONDS = metrics.histogram(
+    "mirror_weather_fetch_seconds", "Time to fetch and format the weather for every location",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+FETCH_FAILURES = metrics.counter("mirror_weather_fetch_failures_total", "Weather fetches that raised an error")
+
+# API config
+DAILY_VARS = ["uv_index_max", "sunrise", "sunset"]
+HOURLY_VARS = [
+    "temperature_2m", "apparent_temperature", "precipitation_probability",
+    "rain", "snowfall", "snow_depth", "showers", "precipitation", "visibility",
+]
+CURRENT_VARS = [
+    "temperature_2m", "relative_humidity_2m", "apparent_temperature",
+    "precipitation", "rain", "showers", "snowfall",
+    "cloud_cover", "wind_direction_10m", "wind_speed_10m",
+]
+
+# Request parameters and display suffixes for each WEATHER_UNITS choice
+UNIT_SYSTEMS: dict[str, dict[str, Any]] = {
+    "imperial": {
+        "params": {"temperature_unit": "fahrenheit", "wind_speed_unit": "mph", "precipitation_unit": "inch"},
+        "temperature": "°F", "precipitation": "in", "snowfall": "in", "snow_depth": "in", "wind": "mph",
+    },
+    "metric": {
+        "params": {"temperature_unit": "celsius", "wind_speed_unit": "kmh", "precipitation_unit": "mm"},
+        "temperature": "°C", "precipitation": "mm", "snowfall": "cm", "snow_depth": "m", "wind": "km/h",
+    },
+}
+
+
+class WeatherClient:
+    """Long-lived Open-Meteo client owning one pooled, cached and retrying session.
+
+    Responses are cached for slightly less than ``UPDATE_INTERVAL`` so every
+    scheduled refresh reaches the network while repeated calls in between
+    (e.g. a restart) are served from the cache.
     """
-    # Setup Open-Meteo client with cache + retry
-    cache_session = requests_cache.CachedSession(".cache", expire_after=3600)
-    retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-    openmeteo = openmeteo_requests.Client(session=retry_session)
-
-    # API config
-    url = "https://api.open-meteo.com/v1/forecast"
-    daily_vars = ["uv_index_max", "sunrise", "sunset"]
-    hourly_vars = [
-        "temperature_2m", "apparent_temperature", "precipitation_probability",
-        "rain", "snowfall", "snow_depth", "showers", "precipitation", "visibility",
-    ]
-    current_vars = [
-        "temperature_2m", "relative_humidity_2m", "apparent_temperature",
-        "precipitation", "rain", "showers", "snowfall",
-        "cloud_cover", "wind_direction_10m", "wind_speed_10m",
-    ]
 
+    def __init__(
+        self,
+        url: str = WEATHER_URL,
+        backend: str = WEATHER_CACHE_BACKEND,
+        expire_after: float = UPDATE_INTERVAL * (1 - WEATHER_JITTER),
+    ) -> None:
+        """Open the cache backend ("memory", "sqlite" or "filesystem") and HTTP session.
+
+        :param url: Forecast endpoint, overridable to point at a local stand-in server
+        """
+        self.url = url
+        self.session = requests_cache.CachedSession(
+            WEATHER_CACHE_NAME, backend=backend, expire_after=max(1, int(expire_after)),
+        )
+        self.session.hooks["response"].append(self._count_response)
+        self.openmeteo = openmeteo_requests.Client(session=retry(self.session, retries=5, backoff_factor=0.2))
+        self.calls = 0
+        self.requests = 0
+        self.cache_hits = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+
+    def _count_response(self, response: Any, *_: Any, **__: Any) -> Any:
+        """Count every HTTP response and whether the cache served it."""
+        # requests_cache also dispatches hooks on the raw network response before
+        # wrapping it; only the wrapped and cached responses carry ``from_cache``
+        if not hasattr(response, "from_cache"):
+            return response
+        self.requests += 1
+        if response.from_cache:
+            self.cache_hits += 1
+        return response
+
+    def weather_api(self, params: dict[str, Any]) -> list:
+        """Request forecasts for ``params`` and record how long it took."""
+        start = time.perf_counter()
+        try:
+            return self.openmeteo.weather_api(self.url, params=params)
+        finally:
+            self.calls += 1
+            self.last_latency = time.perf_counter() - start
+            self.total_latency += self.last_latency
+
+    def metrics(self) -> dict[str, float]:
+        """Return request count, cache hit ratio and latency figures."""
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "cache_hit_ratio": self.cache_hits / self.requests if self.requests else 0.0,
+            "last_latency": self.last_latency,
+            "mean_latency": self.total_latency / self.calls if self.calls else 0.0,
+        }
+
+
+_client: WeatherClient | None = None
+
+
+def get_client() -> WeatherClient:
+    """Return the shared weather client, creating it on first use."""
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = WeatherClient()
+    return _client
+
+
+class LazyRows(Sequence[dict[str, Any]]):
+    """Read-only rows over column arrays, built only when indexed.
+
+    Row ``i`` holds ``"date"`` (``start + i * interval`` in epoch seconds) plus
+    the ``i``-th value of every column, passed through ``formatter`` and cached.
+    """
+
+    def __init__(
+        self,
+        start: int,
+        interval: int,
+        columns: dict[str, Any],
+        formatter: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ) -> None:
+        """Wrap equal-length column arrays that start at ``start`` and step by ``interval``."""
+        self.start = start
+        self.interval = interval
+        self.columns = columns
+        self.formatter = formatter
+        self._length = min((len(values) for values in columns.values()), default=0)
+        self._rows: dict[int, dict[str, Any]] = {}
+
+    def map(self, formatter: Callable[[dict[str, Any]], dict[str, Any]]) -> "LazyRows":
+        """Return a view over the same columns whose rows are passed through ``formatter``."""
+        return LazyRows(self.start, self.interval, self.columns, formatter)
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        """Build (or return the cached) row at ``index``."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        if index not in self._rows:
+            row = {"date": self.start + index * self.interval}
+            row.update({var: values[index].item() for var, values in self.columns.items()})
+            self._rows[index] = self.formatter(row) if self.formatter else row
+        return self._rows[index]
+
+
+def get_weather_data(
+    client: WeatherClient | None = None,
+    locations: list[dict[str, Any]] = WEATHER_LOCATIONS,
+    units: str = WEATHER_UNITS,
+) -> list[tuple]:
+    """Fetch weather data for every location in one Open-Meteo request.
+
+    :param client: Client to fetch with, defaults to the shared one
+    :param locations: Dicts with ``name``, ``latitude``, ``longitude`` and ``timezone``
+    :param units: Key of ``UNIT_SYSTEMS``
+    Returns: One (daily_dict, hourly_dict, current_weather) per location, in order
+    """
+    client = client or get_client()
+    unit_system = UNIT_SYSTEMS[units]
     params = {
-        "latitude": 42.48948,
-        "longitude": -83.14465,
-        "daily": daily_vars,
-        "hourly": hourly_vars,
-        "current": current_vars,
-        "timezone": "America/New_York",
-        "wind_speed_unit": "mph",
-        "temperature_unit": "fahrenheit",
-        "precipitation_unit": "inch",
+        "latitude": ",".join(str(location["latitude"]) for location in locations),
+        "longitude": ",".join(str(location["longitude"]) for location in locations),
+        "timezone": ",".join(location["timezone"] for location in locations),
+        "daily": DAILY_VARS,
+        "hourly": HOURLY_VARS,
+        "current": CURRENT_VARS,
+        **unit_system["params"],
     }
 
-    response = openmeteo.weather_api(url, params=params)[0]
+    responses = client.weather_api(params)
+    logger.info("Weather for %d location(s) fetched in %.2fs, cache hit ratio %.0f%%",
+                len(responses), client.last_latency, 100 * client.metrics()["cache_hit_ratio"])
+    if len(responses) != len(locations):
+        msg = f"Expected {len(locations)} weather responses, got {len(responses)}"
+        raise ValueError(msg)
+
+    fetched_at = time.time()
+    weather = []
+    for location, response in zip(locations, responses, strict=True):
+        daily_dict, hourly_dict, current_weather = parse_response(response)
+        daily_dict, hourly_dict, current_weather = make_pretty(
+            daily_dict, hourly_dict, current_weather, location["timezone"], unit_system,
+        )
+        current_weather["location"] = location["name"]
+        current_weather["timezone"] = location["timezone"]
+        current_weather["fetched_at"] = fetched_at
+        weather.append((daily_dict, hourly_dict, current_weather))
+    return weather
 
+
+def parse_response(response: Any) -> tuple[LazyRows, LazyRows, dict[str, Any]]:
+    """Wrap one location's response as (daily_dict, hourly_dict, current_weather)."""
     # --- Current data ---
     current = response.Current()
     current_weather = {
-        var: current.Variables(i).Value() for i, var in enumerate(current_vars)
+        var: current.Variables(i).Value() for i, var in enumerate(CURRENT_VARS)
     }
     current_weather["time"] = current.Time()
 
     # --- Hourly data ---
     hourly = response.Hourly()
-    hourly_data = {
-        "date": pd.date_range(
-            start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-            end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-            freq=pd.Timedelta(seconds=hourly.Interval()),
-            inclusive="left",
-        ),
-    }
-    for i, var in enumerate(hourly_vars):
-        hourly_data[var] = hourly.Variables(i).ValuesAsNumpy()
-    hourly_dict = pd.DataFrame(hourly_data).to_dict(orient="records")
+    hourly_dict = LazyRows(
+        hourly.Time(),
+        hourly.Interval(),
+        {var: hourly.Variables(i).ValuesAsNumpy() for i, var in enumerate(HOURLY_VARS)},
+    )
 
     # --- Daily data ---
     daily = response.Daily()
-    daily_data = {
-        "date": pd.date_range(
-            start=pd.to_datetime(daily.Time(), unit="s", utc=True),
-            end=pd.to_datetime(daily.TimeEnd(), unit="s", utc=True),
-            freq=pd.Timedelta(seconds=daily.Interval()),
-            inclusive="left",
-        ),
-    }
-    for i, var in enumerate(daily_vars):
+    daily_columns = {}
+    for i, var in enumerate(DAILY_VARS):
         method = "ValuesInt64AsNumpy" if var in ("sunrise", "sunset") else "ValuesAsNumpy"
-        daily_data[var] = getattr(daily.Variables(i), method)()
-    daily_dict = pd.DataFrame(daily_data).to_dict(orient="records")
+        daily_columns[var] = getattr(daily.Variables(i), method)()
+    daily_dict = LazyRows(daily.Time(), daily.Interval(), daily_columns)
 
-    daily_dict, hourly_dict, current_weather = make_pretty(daily_dict, hourly_dict, current_weather)
     return daily_dict, hourly_dict, current_weather
 
 
+def format_day(day: dict[str, Any], timezone: str) -> dict[str, Any]:
+    """Format one daily row for display in the location's ``timezone``."""
+    tz = pytz.timezone(timezone)
+
+    # Convert directly to 12-hour format without seconds
+    day["sunrise"] = datetime.fromtimestamp(day["sunrise"], tz).strftime("%-I:%M %p")
+    day["sunset"] = datetime.fromtimestamp(day["sunset"], tz).strftime("%-I:%M %p")
+    day["date"] = datetime.fromtimestamp(day["date"], tz).strftime("%A, %B %d")
+    day["uv_index_max"] = f"{int(day['uv_index_max'])}"
+    return day
+
+
+def format_hour(hour: dict[str, Any], units: dict[str, Any]) -> dict[str, Any]:
+    """Format one hourly row for display with the suffixes in ``units``."""
+    hour["temperature_2m"] = f"{int(hour['temperature_2m'])} {units['temperature']}"
+    hour["apparent_temperature"] = f"{int(hour['apparent_temperature'])} {units['temperature']}"
+    hour["precipitation_probability"] = f"{hour['precipitation_probability']}%"
+    hour["rain"] = f"{hour['rain']}{units['precipitation']}"
+    hour["snowfall"] = f"{hour['snowfall']}{units['snowfall']}"
+    hour["snow_depth"] = f"{hour['snow_depth']}{units['snow_depth']}"
+    hour["showers"] = f"{hour['showers']}{units['precipitation']}"
+    hour["precipitation"] = f"{hour['precipitation']}{units['precipitation']}"
+    hour["visibility"] = f"{hour['visibility']}m"
+    return hour
+
 
 def make_pretty(
-    daily_dict: list[dict[str, Any]],
-    hourly_dict: list[dict[str, Any]],
+    daily_dict: LazyRows,
+    hourly_dict: LazyRows,
     current_weather: dict[str, Any],
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[str, Any]]:
+    timezone: str,
+    units: dict[str, Any] = UNIT_SYSTEMS["imperial"],
+) -> tuple[LazyRows, LazyRows, dict[str, Any]]:
     """Make the weather data more human readable.
 
+    Daily and hourly rows are only formatted when they are first read.
+
     :param daily_dict: Daily weather data
     :param hourly_dict: Hourly weather data
     :param current_weather: Current weather data
+    :param timezone: Timezone name of the location the data is for
+    :param units: Display suffixes from ``UNIT_SYSTEMS``
     :return: Tuple of (daily_dict, hourly_dict, current_weather) with formatted values
     """
-    eastern = pytz.timezone("US/Eastern")
-
-    # Format daily data
-    for day in daily_dict:
-        eastern = pytz.timezone("US/Eastern")
-
-        # Convert directly to 12-hour format without seconds
-        sunrise_str = datetime.fromtimestamp(day["sunrise"], eastern).strftime("%-I:%M %p")
-        sunset_str  = datetime.fromtimestamp(day["sunset"],  eastern).strftime("%-I:%M %p")
-
-        day["sunrise"] = sunrise_str
-        day["sunset"] = sunset_str
-        day["date"] = day["date"].strftime("%A, %B %d")
-        daily_dict[0]["uv_index_max"] = f"{int(daily_dict[0]['uv_index_max'])}"
-
-    for hour in hourly_dict:
-        hour["temperature_2m"] = f"{int(hour['temperature_2m'])} °F"
-        hour["apparent_temperature"] = f"{int(hour['apparent_temperature'])} °F"
-        hour["precipitation_probability"] = f"{hour['precipitation_probability']}%"
-        hour["rain"] = f"{hour['rain']}in"
-        hour["snowfall"] = f"{hour['snowfall']}in"
-        hour["snow_depth"] = f"{hour['snow_depth']}in"
-        hour["showers"] = f"{hour['showers']}in"
-        hour["precipitation"] = f"{hour['precipitation']}in"
-        hour["visibility"] = f"{hour['visibility']}m"
-
     # Directions array and wind direction index safe computation
     directions = [
         "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
@@ -133,21 +308,99 @@ def make_pretty(
     ]
     wind_direction_index = int((current_weather["wind_direction_10m"] + 11.25) / 22.5) % 16
 
-    current_weather["temperature_2m"] = f"{int(current_weather['temperature_2m'])} °F"
+    temperature = units["temperature"]
+    precipitation = units["precipitation"]
+    current_weather["temperature_2m"] = f"{int(current_weather['temperature_2m'])} {temperature}"
     current_weather["relative_humidity_2m"] = f"{current_weather['relative_humidity_2m']}%"
-    current_weather["apparent_temperature"] = f"{int(current_weather['apparent_temperature'])} °F"
-    current_weather["precipitation"] = f"{current_weather['precipitation']}in"
-    current_weather["rain"] = f"{current_weather['rain']}in"
-    current_weather["showers"] = f"{current_weather['showers']}in"
-    current_weather["snowfall"] = f"{current_weather['snowfall']}in"
+    current_weather["apparent_temperature"] = f"{int(current_weather['apparent_temperature'])} {temperature}"
+    current_weather["precipitation"] = f"{current_weather['precipitation']}{precipitation}"
+    current_weather["rain"] = f"{current_weather['rain']}{precipitation}"
+    current_weather["showers"] = f"{current_weather['showers']}{precipitation}"
+    current_weather["snowfall"] = f"{current_weather['snowfall']}{units['snowfall']}"
     current_weather["cloud_cover"] = f"{current_weather['cloud_cover']}%"
     current_weather["wind_direction_10m"] = f"{directions[wind_direction_index]}"
-    current_weather["wind_speed_10m"] = f"{int(current_weather['wind_speed_10m'])}mph"
+    current_weather["wind_speed_10m"] = f"{int(current_weather['wind_speed_10m'])}{units['wind']}"
 
 
     # Convert to datetime
-    dt = datetime.fromtimestamp(current_weather["time"], eastern)
+    dt = datetime.fromtimestamp(current_weather["time"], pytz.timezone(timezone))
     time_str = dt.strftime("%-I:%M %p")  # Format: H:MM (no leading zero, no seconds)
     current_weather["time"] = time_str
 
-    return daily_dict, hourly_dict, current_weather
+    return (
+        daily_dict.map(partial(format_day, timezone=timezone)),
+        hourly_dict.map(partial(format_hour, units=units)),
+        current_weather,
+    )
+
+
+class WeatherWorker(threading.Thread):
+    """Fetch weather in the background and post each result to the GUI.
+
+    ``post`` is called as ``post("weather_updated", weather)`` with the list
+    returned by ``fetch`` (one (daily, hourly, current) tuple per location),
+    normally with ``window.write_event_value``, so the GUI loop never waits on
+    the network. Refreshes are spread by a random jitter so several mirrors do
+    not all hit the API at once; a failed fetch is retried sooner.
+
+    On start the last saved snapshot is posted straight away, before the first
+    fetch, unless the caller passed weather it already shows as ``last``. Each
+    good fetch replaces it. After a failed fetch the last data
+    is posted again so the display can mark it as stale.
+    """
+
+    def __init__(
+        self,
+        post: Callable[[str, Any], None],
+        fetch: Callable[[], list[tuple]] = get_weather_data,
+        interval: float = UPDATE_INTERVAL,
+        last: list[tuple] | None = None,
+    ) -> None:
+        """Set where results go, how to fetch them and the refresh interval.
+
+        ``last`` is weather the caller already shows, such as the snapshot; the
+        worker then skips loading and posting the snapshot itself.
+        """
+        super().__init__(name="weather", daemon=True)
+        self.post = post
+        self.fetch = fetch
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.last = last
+
+    def next_delay(self, *, succeeded: bool) -> float:
+        """Return seconds until the next fetch, with +/- ``WEATHER_JITTER`` spread."""
+        base = self.interval if succeeded else min(self.interval, WEATHER_RETRY_INTERVAL)
+        return base * (1 + random.uniform(-WEATHER_JITTER, WEATHER_JITTER))
+
+    def run(self) -> None:
+        """Show the snapshot, fetch immediately, then on schedule until stopped."""
+        if self.last is None:
+            self.last = load_snapshot()
+            if self.last is not None:
+                self.post("weather_updated", self.last)
+
+        while not self.stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                data = self.fetch()
+            except Exception:
+                logger.exception("Failed to fetch weather")
+                FETCH_FAILURES.inc()
+                succeeded = False
+                if self.last is not None:
+                    self.post("weather_updated", self.last)
+            else:
+                FETCH_SECONDS.observe(time.perf_counter() - start)
+                self.last = data
+                self.post("weather_updated", data)
+                succeeded = True
+                try:
+                    save_snapshot(data)
+                except OSError:
+                    logger.exception("Failed to save weather snapshot")
+            self.stop_event.wait(self.next_delay(succeeded=succeeded))
+
+    def stop(self) -> None:
+        """Ask the worker to exit after its current fetch."""
+        self.stop_event.set()
@@ -0,0 +1,53 @@
+"""The last fetched weather, saved to disk so the mirror can show it before the network is up.
+
+Only the standard library is imported here, so ``main`` can draw the snapshot
+before the Open-Meteo client and numpy behind :mod:`weather` are loaded.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from configuration.settings import WEATHER_SNAPSHOT_FILE, WEATHER_STALE_AFTER
+from fileio import atomic_write_text
+
+# Rows of each series kept in the on-disk snapshot
+SNAPSHOT_ROWS = 24
+
+
+def save_snapshot(weather: list[tuple], path: Path = WEATHER_SNAPSHOT_FILE) -> None:
+    """Write the first few formatted rows of every location to disk as JSON.
+
+    The file is written to a temporary name and renamed so a crash never
+    leaves a half-written snapshot behind.
+    """
+    snapshot = {
+        "locations": [
+            {
+                "daily": list(daily_dict[:SNAPSHOT_ROWS]),
+                "hourly": list(hourly_dict[:SNAPSHOT_ROWS]),
+                "current": current_weather,
+            }
+            for daily_dict, hourly_dict, current_weather in weather
+        ],
+    }
+    atomic_write_text(path, json.dumps(snapshot))
+
+
+def load_snapshot(path: Path = WEATHER_SNAPSHOT_FILE) -> list[tuple] | None:
+    """Return the last saved weather in the same shape as get_weather_data, or None."""
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+        return [
+            (location["daily"], location["hourly"], location["current"])
+            for location in snapshot["locations"]
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def is_stale(current_weather: dict[str, Any], max_age: float = WEATHER_STALE_AFTER) -> bool:
+    """Return True if ``current_weather`` was fetched more than ``max_age`` seconds ago."""
+    return time.time() - current_weather.get("fetched_at", 0) > max_age
+